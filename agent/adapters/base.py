@@ -1,6 +1,47 @@
 
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+import base64
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Union
+
+
+class ScreenshotResult:
+    """A PNG screenshot kept in the base64 form the MCP server sent it in.
+
+    Length and prefix checks work without decoding the whole image, and
+    callers that persist or forward base64 (act_step artifacts, vision
+    prompts) can use ``b64`` directly; ``bytes`` decodes on first access.
+    """
+
+    def __init__(self, b64: str):
+        # Servers may MIME-wrap the payload; drop the line breaks so lengths
+        # and offsets below count base64 characters only.
+        self.b64 = "".join(b64.split())
+
+    def __len__(self) -> int:
+        """Decoded size in bytes, computed from the base64 length."""
+        b64 = self.b64.rstrip("=")
+        return len(b64) * 3 // 4
+
+    def __bytes__(self) -> bytes:
+        return self.bytes
+
+    @cached_property
+    def bytes(self) -> bytes:
+        return base64.b64decode(self.b64)
+
+    def startswith(self, prefix: bytes) -> bool:
+        """Check the leading bytes, decoding only the base64 quanta they span."""
+        chars = -(-len(prefix) // 3) * 4
+        return base64.b64decode(self.b64[:chars]).startswith(prefix)
+
+
+def screenshot_to_b64(image: Union[bytes, ScreenshotResult]) -> str:
+    """Base64 text for a screenshot, without a decode/re-encode round trip."""
+    if isinstance(image, ScreenshotResult):
+        return image.b64
+    return base64.b64encode(image).decode("ascii")
+
 
 class DesktopAdapter:
     """Abstract adapter for desktop automation operations."""
@@ -10,7 +51,7 @@ class DesktopAdapter:
     def focus_window(self, hwnd: Optional[int] = None, title_regex: Optional[str] = None) -> Dict[str, Any]:
         raise NotImplementedError
 
-    def screenshot(self, hwnd: Optional[int] = None) -> bytes:
+    def screenshot(self, hwnd: Optional[int] = None) -> Union[bytes, ScreenshotResult]:
         raise NotImplementedError
 
     def keypress(self, keys: str) -> Dict[str, Any]:
@@ -1,8 +1,7 @@
 
 from __future__ import annotations
 from typing import Any, Dict, List, Optional
-import base64
-from .base import DesktopAdapter
+from .base import DesktopAdapter, ScreenshotResult
 from agent.mcp.client import MCPHTTPClient
 
 class MCPAdapter(DesktopAdapter):
@@ -28,13 +27,13 @@ class MCPAdapter(DesktopAdapter):
     def focus_window(self, hwnd: Optional[int] = None, title_regex: Optional[str] = None) -> Dict[str, Any]:
         return self._call("focus_window", {"hwnd": hwnd, "title_regex": title_regex})
 
-    def screenshot(self, hwnd: Optional[int] = None) -> bytes:
+    def screenshot(self, hwnd: Optional[int] = None) -> ScreenshotResult:
         data = self._call("screenshot", {"hwnd": hwnd})
-        # Expect base64-encoded PNG in 'image'
+        # Expect base64-encoded PNG in 'image'; decoded lazily on demand
         b64 = data.get("image")
         if not b64:
             raise RuntimeError("MCP server returned no 'image' field")
-        return base64.b64decode(b64)
+        return ScreenshotResult(b64)
 
     def keypress(self, keys: str) -> Dict[str, Any]:
         return self._call("keypress", {"keys": keys})
@@ -2,11 +2,9 @@ from __future__ import annotations
 import json
 import subprocess
 import threading
-from typing import Any, Dict, List, Optional, BinaryIO
-from queue import Queue, Empty
-import base64
+from typing import Any, Dict, List, Optional, BinaryIO, Set, Tuple
 import logging
-from .base import DesktopAdapter
+from .base import DesktopAdapter, ScreenshotResult
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +29,13 @@ class StdioMCPAdapter(DesktopAdapter):
         self.env = env or {}
         self.process: Optional[subprocess.Popen] = None
         self._request_id = 0
-        self._response_queue: Queue = Queue()
+        # Responses are routed to callers by request id, so several threads
+        # can have calls in flight on the same server at once.
+        self._send_lock = threading.Lock()
+        self._responses: Dict[int, Dict[str, Any]] = {}
+        # Ids whose caller timed out; their late replies are dropped on arrival
+        self._abandoned: Set[int] = set()
+        self._responses_ready = threading.Condition()
         self._reader_thread: Optional[threading.Thread] = None
         self._running = False
         
@@ -61,7 +65,7 @@ class StdioMCPAdapter(DesktopAdapter):
         self._reader_thread.start()
         
         # Send initialize request
-        self._send_request("initialize", {
+        init_id = self._send_request("initialize", {
             "protocolVersion": "2024-11-05",
             "capabilities": {},
             "clientInfo": {
@@ -71,7 +75,7 @@ class StdioMCPAdapter(DesktopAdapter):
         })
         
         # Wait for initialize response
-        response = self._wait_for_response(timeout=5.0)
+        response = self._wait_for_response(init_id, timeout=5.0)
         if not response or "error" in response:
             raise RuntimeError(f"Failed to initialize MCP server: {response}")
         
@@ -100,7 +104,7 @@ class StdioMCPAdapter(DesktopAdapter):
                         for line in lines:
                             if line.strip():
                                 response = json.loads(line.decode('utf-8'))
-                                self._response_queue.put(response)
+                                self._deliver(response)
                         buffer = b""
                     except json.JSONDecodeError:
                         # Not complete yet, keep buffering
@@ -110,22 +114,58 @@ class StdioMCPAdapter(DesktopAdapter):
                     logger.error(f"Error reading MCP response: {e}")
                 break
     
+    def _deliver(self, response: Dict[str, Any]):
+        """Hand a response from the reader thread to whoever awaits its id."""
+        response_id = response.get("id") if isinstance(response, dict) else None
+        if response_id is None:
+            # Server-initiated notifications carry no id and answer nothing
+            return
+        with self._responses_ready:
+            if response_id in self._abandoned:
+                self._abandoned.discard(response_id)
+                return
+            self._responses[response_id] = response
+            self._responses_ready.notify_all()
+    
     def _send_request(self, method: str, params: Dict[str, Any]) -> int:
         """Send a JSON-RPC request to the MCP server."""
-        self._request_id += 1
-        request = {
-            "jsonrpc": "2.0",
-            "id": self._request_id,
-            "method": method,
-            "params": params
-        }
+        with self._send_lock:
+            self._request_id += 1
+            request_id = self._request_id
+            request = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params
+            }
+            
+            if self.process and self.process.stdin:
+                message = json.dumps(request) + '\n'
+                self.process.stdin.write(message.encode('utf-8'))
+                self.process.stdin.flush()
         
-        if self.process and self.process.stdin:
-            message = json.dumps(request) + '\n'
-            self.process.stdin.write(message.encode('utf-8'))
-            self.process.stdin.flush()
+        return request_id
+    
+    def _send_requests(self, method: str, params_list: List[Dict[str, Any]]) -> List[int]:
+        """Send several JSON-RPC requests with a single write to the server."""
+        ids = []
+        frames = []
+        with self._send_lock:
+            for params in params_list:
+                self._request_id += 1
+                ids.append(self._request_id)
+                frames.append(json.dumps({
+                    "jsonrpc": "2.0",
+                    "id": self._request_id,
+                    "method": method,
+                    "params": params
+                }) + '\n')
+            
+            if self.process and self.process.stdin:
+                self.process.stdin.write("".join(frames).encode('utf-8'))
+                self.process.stdin.flush()
         
-        return self._request_id
+        return ids
     
     def _send_notification(self, method: str, params: Dict[str, Any]):
         """Send a JSON-RPC notification (no response expected)."""
@@ -140,13 +180,14 @@ class StdioMCPAdapter(DesktopAdapter):
             self.process.stdin.write(message.encode('utf-8'))
             self.process.stdin.flush()
     
-    def _wait_for_response(self, timeout: float = 10.0) -> Optional[Dict[str, Any]]:
-        """Wait for the next response from the queue."""
-        try:
-            return self._response_queue.get(timeout=timeout)
-        except Empty:
-            logger.warning(f"Timeout waiting for MCP response after {timeout}s")
-            return None
+    def _wait_for_response(self, request_id: int, timeout: float = 10.0) -> Optional[Dict[str, Any]]:
+        """Wait for the response to a specific request id."""
+        with self._responses_ready:
+            if self._responses_ready.wait_for(lambda: request_id in self._responses, timeout=timeout):
+                return self._responses.pop(request_id)
+            self._abandoned.add(request_id)
+        logger.warning(f"Timeout waiting for MCP response {request_id} after {timeout}s")
+        return None
     
     def _call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Call an MCP tool and return the result."""
@@ -155,7 +196,7 @@ class StdioMCPAdapter(DesktopAdapter):
             "arguments": arguments
         })
         
-        response = self._wait_for_response()
+        response = self._wait_for_response(req_id)
         if not response:
             raise RuntimeError(f"No response for tool call: {tool_name}")
         
@@ -164,6 +205,35 @@ class StdioMCPAdapter(DesktopAdapter):
         
         return response.get("result", {})
     
+    def call_tools_pipelined(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        timeout: float = 10.0,
+    ) -> List[Dict[str, Any]]:
+        """Call several MCP tools with all requests in flight at once.
+        
+        Every request is written before any response is read, so N calls cost
+        one pipe write and roughly one round-trip instead of N. Responses are
+        matched by id and returned in call order.
+        """
+        ids = self._send_requests("tools/call", [
+            {"name": tool_name, "arguments": arguments}
+            for tool_name, arguments in calls
+        ])
+        
+        # All requests are already in flight, so waiting in order costs
+        # roughly the slowest round-trip rather than their sum
+        responses = [self._wait_for_response(response_id, timeout=timeout) for response_id in ids]
+        
+        if not all(responses):
+            missing = sum(1 for response in responses if not response)
+            raise RuntimeError(f"No response for {missing} pipelined tool call(s)")
+        for response in responses:
+            if "error" in response:
+                raise RuntimeError(f"MCP tool error: {response['error']}")
+        
+        return [response.get("result", {}) for response in responses]
+    
     # DesktopAdapter interface implementation
     
     def list_windows(self, app: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -181,8 +251,8 @@ class StdioMCPAdapter(DesktopAdapter):
         
         return self._call_tool("focus_window", args)
     
-    def screenshot(self, hwnd: Optional[int] = None) -> bytes:
-        """Take a screenshot of a window."""
+    def screenshot(self, hwnd: Optional[int] = None) -> ScreenshotResult:
+        """Take a screenshot of a window (base64 PNG, decoded lazily)."""
         result = self._call_tool("screenshot", {"hwnd": hwnd} if hwnd else {})
         
         # Expect base64-encoded image
@@ -190,7 +260,7 @@ class StdioMCPAdapter(DesktopAdapter):
         if not b64_image:
             raise RuntimeError("MCP server returned no image data")
         
-        return base64.b64decode(b64_image)
+        return ScreenshotResult(b64_image)
     
     def keypress(self, keys: str) -> Dict[str, Any]:
         """Send a keypress (e.g., 'Ctrl+Shift+P')."""
@@ -209,12 +279,16 @@ class StdioMCPAdapter(DesktopAdapter):
         """Set clipboard contents."""
         return self._call_tool("clipboard_set", {"text": text})
     
-    def __del__(self):
-        """Cleanup: terminate the MCP server process."""
+    def close(self):
+        """Stop the reader thread and terminate the MCP server process."""
         self._running = False
-        if self.process:
+        if self.process and self.process.poll() is None:
             try:
                 self.process.terminate()
                 self.process.wait(timeout=5)
             except:
                 self.process.kill()
+
+    def __del__(self):
+        """Cleanup: terminate the MCP server process."""
+        self.close()
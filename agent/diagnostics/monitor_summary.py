@@ -4,9 +4,13 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from statistics import mean
 from typing import Any, Dict, List, Optional
 
+try:  # Optional: orjson parses large summaries several times faster
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
 __all__ = [
     "load_summary",
     "compute_window_stats",
@@ -17,9 +21,27 @@ __all__ = [
 def load_summary(path: Path | str) -> Dict[str, Any]:
     """Load a monitor run summary JSON file."""
 
-    summary_path = Path(path)
-    data = json.loads(summary_path.read_text(encoding="utf-8"))
-    return data
+    # Parse the raw bytes directly; both decoders handle UTF-8 themselves
+    raw = Path(path).read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # The stdlib writer emits NaN/Infinity and arbitrarily large
+            # integers, which orjson rejects; json reads them back.
+            pass
+    return json.loads(raw)
+
+
+# Numeric per-window fields averaged by compute_window_stats, in the order
+# their running sums are kept
+_AVERAGED_FIELDS = (
+    "focus_ms",
+    "state_ms",
+    "transcript_ms",
+    "copilot_text_length",
+    "transcript_length",
+)
 
 
 def compute_window_stats(summary: Dict[str, Any]) -> Dict[str, Any]:
@@ -27,31 +49,51 @@ def compute_window_stats(summary: Dict[str, Any]) -> Dict[str, Any]:
 
     windows: List[Dict[str, Any]] = summary.get("window_metrics") or []
 
-    def _numbers(field: str) -> List[float]:
-        values: List[float] = []
-        for metric in windows:
-            value = metric.get(field)
+    # Accumulate every statistic in a single pass over the window records;
+    # non-numeric (or missing) values are left out of that field's average
+    busy = ready = missing = 0
+    sums = [0.0] * len(_AVERAGED_FIELDS)
+    counts = [0] * len(_AVERAGED_FIELDS)
+    maxima: List[Optional[float]] = [None] * len(_AVERAGED_FIELDS)
+    for metric in windows:
+        get = metric.get
+        is_busy = get("is_busy")
+        if is_busy:
+            busy += 1
+        elif is_busy is False:
+            ready += 1
+        if not get("screenshot"):
+            missing += 1
+        for i, field in enumerate(_AVERAGED_FIELDS):
+            value = get(field)
             if isinstance(value, (int, float)):
-                values.append(float(value))
-        return values
-
-    def _avg(values: List[float]) -> float:
-        if not values:
-            return 0.0
-        return round(mean(values), 2)
+                value = float(value)
+                sums[i] += value
+                counts[i] += 1
+                if maxima[i] is None or value > maxima[i]:
+                    maxima[i] = value
+
+    avg = {
+        field: round(sums[i] / counts[i], 2) if counts[i] else 0.0
+        for i, field in enumerate(_AVERAGED_FIELDS)
+    }
+    peak = {
+        field: maxima[i] if maxima[i] is not None else 0.0
+        for i, field in enumerate(_AVERAGED_FIELDS)
+    }
 
     stats = {
         "window_count": len(windows),
-        "busy_windows": sum(1 for m in windows if m.get("is_busy")),
-        "ready_windows": sum(1 for m in windows if m.get("is_busy") is False),
-        "screenshots_missing": sum(1 for m in windows if not m.get("screenshot")),
-        "avg_focus_ms": _avg(_numbers("focus_ms")),
-        "avg_state_ms": _avg(_numbers("state_ms")),
-        "avg_transcript_ms": _avg(_numbers("transcript_ms")),
-        "avg_copilot_chars": _avg(_numbers("copilot_text_length")),
-        "avg_transcript_chars": _avg(_numbers("transcript_length")),
-        "max_copilot_chars": max(_numbers("copilot_text_length") or [0.0]),
-        "max_transcript_chars": max(_numbers("transcript_length") or [0.0]),
+        "busy_windows": busy,
+        "ready_windows": ready,
+        "screenshots_missing": missing,
+        "avg_focus_ms": avg["focus_ms"],
+        "avg_state_ms": avg["state_ms"],
+        "avg_transcript_ms": avg["transcript_ms"],
+        "avg_copilot_chars": avg["copilot_text_length"],
+        "avg_transcript_chars": avg["transcript_length"],
+        "max_copilot_chars": peak["copilot_text_length"],
+        "max_transcript_chars": peak["transcript_length"],
     }
 
     return stats
@@ -13,8 +13,11 @@ Vision Support:
 """
 from __future__ import annotations
 import os
+import atexit
 import base64
 from typing import Optional, Union, List, Dict, Any
+import httpx
+from openai import DefaultHttpxClient
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 from agent.config import LLMConfig
@@ -26,6 +29,44 @@ logger = logging.getLogger(__name__)
 # Global secret provider instance (lazy-initialized)
 _secret_provider: Optional[SecretProvider] = None
 
+# Keep idle connections to the Z.ai endpoints open well past the SDK's short
+# default expiry: LLM calls are seconds apart, and each reconnect is a new
+# TLS handshake.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60.0)
+
+
+# Process-wide HTTP client shared by every ChatOpenAI (lazy-initialized)
+_shared_http_client: Optional[httpx.Client] = None
+
+
+def get_shared_http_client() -> httpx.Client:
+    """
+    Get the process-wide HTTP client used by every ChatOpenAI we create.
+
+    Sharing one connection pool means successive LLM clients (one per
+    reason_step, vision check, ...) reuse warm keep-alive connections.
+    It is the OpenAI SDK's DefaultHttpxClient, so the SDK's timeout,
+    redirect and proxy defaults still apply; only the pool limits change.
+    Only the sync client is shared; async clients are tied to the event
+    loop they were created on, so those stay per-instance.
+
+    The client is closed at interpreter exit, or earlier via
+    close_shared_http_client(); the next call then opens a fresh one.
+    """
+    global _shared_http_client
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        _shared_http_client = DefaultHttpxClient(limits=_HTTP_LIMITS)
+    return _shared_http_client
+
+
+@atexit.register
+def close_shared_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections, if open."""
+    global _shared_http_client
+    if _shared_http_client is not None:
+        _shared_http_client.close()
+        _shared_http_client = None
+
 
 def get_global_secret_provider() -> SecretProvider:
     """
@@ -139,6 +180,7 @@ def create_llm_client(
         max_tokens=config.max_tokens,
         # Z.ai GLM-4.6 supports streaming
         streaming=True,
+        http_client=get_shared_http_client(),
     )
 
     return llm
@@ -256,6 +298,7 @@ def create_vision_llm(
         temperature=config.temperature,
         max_tokens=config.max_tokens,
         streaming=False,  # Vision typically doesn't stream
+        http_client=get_shared_http_client(),
     )
 
     return llm
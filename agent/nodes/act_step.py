@@ -1,9 +1,9 @@
 
 from __future__ import annotations
-import base64, time, logging, asyncio
-from typing import Dict, Any, Optional, List
+import re, time, logging, asyncio
+from typing import Dict, Any, Optional, List, Union
 from agent.observability import span, log_event
-from agent.adapters.base import DesktopAdapter
+from agent.adapters.base import DesktopAdapter, screenshot_to_b64
 from agent.llm_client import create_vision_llm, create_vision_message
 from agent.tools.vscode_copilot_monitor import VSCodeCopilotMonitor
 from agent.secrets.factory import SecretProviderFactory
@@ -50,11 +50,13 @@ def _verify_with_vision(screenshot_b64: str, state: Dict[str, Any], question: st
             "error": str(e)
         }
 
-def _find_vscode_window(adapter: DesktopAdapter, title_regex: str) -> Optional[Dict[str, Any]]:
+def _find_vscode_window(adapter: DesktopAdapter, title_regex: Union[str, re.Pattern]) -> Optional[Dict[str, Any]]:
+    # Compile once up front (callers may pass a precompiled pattern)
+    pattern = title_regex if isinstance(title_regex, re.Pattern) else re.compile(title_regex)
     windows = adapter.list_windows(app="Code.exe")
     for w in windows:
         title = w.get("title") or ""
-        if re.match(title_regex, title):
+        if pattern.match(title):
             return w
     # fallback: return first Code.exe window if regex too strict
     for w in windows:
@@ -116,7 +118,7 @@ def act_step(state: Dict[str, Any]) -> Dict[str, Any]:
 
         # Screenshot before
         pre_img = adapter.screenshot(hwnd=hwnd)
-        pre_b64 = base64.b64encode(pre_img).decode("ascii")
+        pre_b64 = screenshot_to_b64(pre_img)
         
         # Vision check: Is Copilot Chat open?
         pre_vision = _verify_with_vision(
@@ -167,13 +169,11 @@ def act_step(state: Dict[str, Any]) -> Dict[str, Any]:
 
             if target:
                 # Prefer transcript_diff if available; else transcript_length doesn't expose content, so rely on monitor history
-                # The debug monitor stores latest transcript in monitor.history[title]['transcript']
-                title_key = target.get("title") or target_title
-                transcript_text = ""
-                try:
-                    transcript_text = monitor.history.get(title_key, {}).get("transcript", "")
-                except Exception:
-                    transcript_text = ""
+                # The monitor stores the latest transcript in monitor.history[key].transcript,
+                # keyed by window handle when known (else title)
+                history_key = target.get("key") or target.get("title") or target_title
+                entry = monitor.history.get(history_key)
+                transcript_text = entry.transcript if entry is not None else ""
                 copied = transcript_text or copied
         
         except Exception as e:
@@ -193,7 +193,7 @@ def act_step(state: Dict[str, Any]) -> Dict[str, Any]:
 
         # Screenshot after
         post_img = adapter.screenshot(hwnd=hwnd)
-        post_b64 = base64.b64encode(post_img).decode("ascii")
+        post_b64 = screenshot_to_b64(post_img)
 
         report = {
             "status": "ok",
@@ -48,20 +48,41 @@ def _format_work_items(work_items: list[Dict[str, Any]]) -> str:
     return "\n".join(items_str)
 
 
-def _select_work_item_with_llm(
-    state: Dict[str, Any],
-    llm
-) -> Optional[tuple[Dict[str, Any], str, str]]:
-    """
-    Use LLM to intelligently select the next work item.
+# Anthropic-style marker for the end of a cacheable prompt prefix
+_EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
+_SELECTION_QUESTION = """
+Select the most appropriate work item to execute next. Consider:
+- Repository health and activity
+- PR status and blockers
+- Plan alignment and priorities
+- Load balancing across repositories
+
+Respond with a JSON object containing your reasoning and selection.
+"""
 
-    Returns:
-        Tuple of (selected_work_item, reasoning, message) or None if no items available
-    """
-    work_items = state.get("work_items", [])
-    if not work_items:
-        return None
 
+def _prompt_cache_enabled(state: Dict[str, Any]) -> bool:
+    """Whether settings ask for explicit cache_control markers on the prompt prefix."""
+    settings = state.get("_settings")
+    llm_config = getattr(settings, "llm", None)
+    return bool(getattr(llm_config, "prompt_cache_control", False))
+
+
+def _cacheable(text: str, cache_control: Optional[Dict[str, str]]):
+    """Message content for a prefix block, tagged with cache_control if given."""
+    if not cache_control:
+        return text
+    return [{"type": "text", "text": text, "cache_control": cache_control}]
+
+
+def _build_selection_messages(state: Dict[str, Any], work_items: list[Dict[str, Any]]) -> list:
+    """Build the messages asking the LLM to pick a work item.
+
+    Ordered from most to least stable so provider prompt caches can reuse
+    the prefix across calls: the static system prompt, then the
+    repo/work-item/plan snapshot, then the short per-call question.
+    """
     repos = state.get("repos", {})
     plan = state.get("plan", {})
 
@@ -69,8 +90,7 @@ def _select_work_item_with_llm(
     repo_context = _format_repo_context(repos)
     work_items_context = _format_work_items(work_items)
 
-    # Create the prompt
-    user_message = f"""
+    context_message = f"""
 Current state of repositories:
 {repo_context}
 
@@ -79,74 +99,209 @@ Available work items to choose from:
 
 Plan objectives:
 {json.dumps(plan.get('objectives', []), indent=2)}
-
-Select the most appropriate work item to execute next. Consider:
-- Repository health and activity
-- PR status and blockers
-- Plan alignment and priorities
-- Load balancing across repositories
-
-Respond with a JSON object containing your reasoning and selection.
 """
 
-    messages = [
-        SystemMessage(content=_rs),
-        HumanMessage(content=user_message)
+    cache_control = _EPHEMERAL_CACHE_CONTROL if _prompt_cache_enabled(state) else None
+    return [
+        SystemMessage(content=_cacheable(_rs, cache_control)),
+        HumanMessage(content=_cacheable(context_message, cache_control)),
+        HumanMessage(content=_SELECTION_QUESTION)
     ]
 
+
+def _strip_code_fence(response_text: str) -> str:
+    """Return the JSON payload, unwrapping a markdown code block if present."""
+    # Try to extract JSON if it's wrapped in markdown code blocks
+    if "```json" in response_text:
+        json_start = response_text.find("```json") + 7
+        json_end = response_text.find("```", json_start)
+        response_text = response_text[json_start:json_end].strip()
+    elif "```" in response_text:
+        json_start = response_text.find("```") + 3
+        json_end = response_text.find("```", json_start)
+        response_text = response_text[json_start:json_end].strip()
+    return response_text
+
+
+def _parse_selection(
+    response_text: str,
+    work_items: list[Dict[str, Any]]
+) -> tuple[Dict[str, Any], str, str]:
+    """Turn the LLM's JSON decision into (work_item, reasoning, message)."""
+    # Parse JSON response
+    decision = json.loads(_strip_code_fence(response_text))
+    return _resolve_decision(decision, work_items)
+
+
+def _resolve_decision(
+    decision: Dict[str, Any],
+    work_items: list[Dict[str, Any]]
+) -> tuple[Dict[str, Any], str, str]:
+    """Map one decision object onto a work item."""
+    # Find the selected work item
+    selected_id = decision.get("selected_work_item_id")
+    reasoning = decision.get("reasoning", "No reasoning provided")
+    message = decision.get("message_to_post", "Sync on current plan and blockers.")
+
+    # Try to find work item by ID or index
+    selected_item = None
+
+    # Try as index first
+    try:
+        idx = int(selected_id)
+        if 0 <= idx < len(work_items):
+            selected_item = work_items[idx]
+    except (ValueError, TypeError):
+        pass
+
+    # Try as task_id
+    if not selected_item:
+        for item in work_items:
+            if item.get("id") == selected_id or item.get("task_id") == selected_id:
+                selected_item = item
+                break
+
+    # Fallback to first item
+    if not selected_item:
+        selected_item = work_items[0]
+        reasoning += " (Fallback: using first work item due to ID mismatch)"
+
+    return (selected_item, reasoning, message)
+
+
+def _fallback_selection(
+    state: Dict[str, Any],
+    work_items: list[Dict[str, Any]],
+    error: Exception
+) -> tuple[Dict[str, Any], str, str]:
+    """Round-robin selection used when the LLM call or its parsing fails."""
+    # Log error and fallback to simple selection
+    print(f"Warning: LLM selection failed ({error}), falling back to round-robin")
+    idx = state.get("_next_idx", 0) % len(work_items)
+    state["_next_idx"] = idx + 1
+    return (work_items[idx], f"Fallback selection due to error: {error}", "Sync on current plan and blockers.")
+
+
+def _select_work_item_with_llm(
+    state: Dict[str, Any],
+    llm
+) -> Optional[tuple[Dict[str, Any], str, str]]:
+    """
+    Use LLM to intelligently select the next work item.
+
+    Returns:
+        Tuple of (selected_work_item, reasoning, message) or None if no items available
+    """
+    work_items = state.get("work_items", [])
+    if not work_items:
+        return None
+
+    messages = _build_selection_messages(state, work_items)
+
     try:
         response = llm.invoke(messages)
-        response_text = response.content
-
-        # Parse JSON response
-        # Try to extract JSON if it's wrapped in markdown code blocks
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-        elif "```" in response_text:
-            json_start = response_text.find("```") + 3
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-
-        decision = json.loads(response_text)
-
-        # Find the selected work item
-        selected_id = decision.get("selected_work_item_id")
-        reasoning = decision.get("reasoning", "No reasoning provided")
-        message = decision.get("message_to_post", "Sync on current plan and blockers.")
-
-        # Try to find work item by ID or index
-        selected_item = None
-
-        # Try as index first
-        try:
-            idx = int(selected_id)
-            if 0 <= idx < len(work_items):
-                selected_item = work_items[idx]
-        except (ValueError, TypeError):
-            pass
-
-        # Try as task_id
-        if not selected_item:
-            for item in work_items:
-                if item.get("id") == selected_id or item.get("task_id") == selected_id:
-                    selected_item = item
-                    break
-
-        # Fallback to first item
-        if not selected_item:
-            selected_item = work_items[0]
-            reasoning += " (Fallback: using first work item due to ID mismatch)"
-
-        return (selected_item, reasoning, message)
+        return _parse_selection(response.content, work_items)
+    except Exception as e:
+        if not state.get("_llm_fallback", True):
+            raise
+        return _fallback_selection(state, work_items, e)
+
+
+async def _aselect_work_item_with_llm(
+    state: Dict[str, Any],
+    llm
+) -> Optional[tuple[Dict[str, Any], str, str]]:
+    """
+    Async variant of _select_work_item_with_llm using llm.ainvoke.
+
+    Returns:
+        Tuple of (selected_work_item, reasoning, message) or None if no items available
+    """
+    work_items = state.get("work_items", [])
+    if not work_items:
+        return None
+
+    messages = _build_selection_messages(state, work_items)
+
+    try:
+        response = await llm.ainvoke(messages)
+        return _parse_selection(response.content, work_items)
+    except Exception as e:
+        if not state.get("_llm_fallback", True):
+            raise
+        return _fallback_selection(state, work_items, e)
+
 
+def _create_llm_for_state(state: Dict[str, Any]):
+    """Create the Reasoner LLM from state["_settings"], or None if unavailable.
+
+    A ready-made client in state["_llm"] is used as-is, so callers running
+    many steps can share one client (and its connection pool).
+    """
+    llm = state.get("_llm")
+    if llm is not None:
+        return llm
+
+    # Get LLM configuration from state (passed as _settings from main.py)
+    settings = state.get("_settings")
+    if not settings:
+        # Fallback: no settings available
+        return None
+
+    # Create LLM client
+    try:
+        return create_reasoner_llm(settings.llm)
     except Exception as e:
-        # Log error and fallback to simple selection
-        print(f"Warning: LLM selection failed ({e}), falling back to round-robin")
-        idx = state.get("_next_idx", 0) % len(work_items)
-        state["_next_idx"] = idx + 1
-        return (work_items[idx], f"Fallback selection due to error: {e}", "Sync on current plan and blockers.")
+        print(f"Error creating LLM client: {e}")
+        return None
+
+
+def _build_envelope(
+    state: Dict[str, Any],
+    selection: tuple[Dict[str, Any], str, str]
+) -> Optional[Dict[str, Any]]:
+    """Build the desktop task envelope for a selection, or None if its repo is unknown."""
+    wi, reasoning, message = selection
+
+    # Get repo info
+    repo = state["repos"].get(wi["repo_name"])
+    if not repo:
+        return None
+
+    # Create task envelope with LLM-generated message
+    return {
+        "type": "desktop_task",
+        "intent": "harvest_and_nudge",
+        "target_repo_path": repo["path"],
+        "payload": {
+            "message_to_post": message,
+            "copy_scope": {"mode": "last_n", "n": 10}
+        },
+        "meta": {
+            "task_id": wi.get("id", wi.get("task_id")),
+            "repo_name": wi["repo_name"],
+            "reasoning": reasoning  # Include LLM's reasoning for observability
+        }
+    }
+
+
+def _apply_selection(
+    state: Dict[str, Any],
+    result: Optional[tuple[Dict[str, Any], str, str]]
+) -> Dict[str, Any]:
+    """Store the task envelope for the selected work item (or None) on state."""
+    envelope = _build_envelope(state, result) if result else None
+    state["task_envelope"] = envelope
+    if envelope is None:
+        return state
+
+    wi, reasoning, _ = result
+
+    # Log reasoning for debugging
+    print(f"[Reasoner] Selected: {wi['repo_name']}/{wi.get('task_id')}")
+    print(f"[Reasoner] Reasoning: {reasoning}")
+
+    return state
 
 
 def reason_step(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -154,59 +309,34 @@ def reason_step(state: Dict[str, Any]) -> Dict[str, Any]:
     Reasoner node: Use LLM to intelligently select next work item.
 
     This replaces the naive round-robin with GLM-4.6 powered reasoning
-    that considers repo health, PR status, and plan priorities.
+    that considers repo health, PR status, and plan priorities. LLM or
+    parse errors fall back to round-robin unless state["_llm_fallback"]
+    is False, in which case they are raised.
     """
     with span("ReasonStep"):
-        # Get LLM configuration from state (passed as _settings from main.py)
-        settings = state.get("_settings")
-        if not settings:
-            # Fallback: no settings available
-            state["task_envelope"] = None
-            return state
-
-        # Create LLM client
-        try:
-            llm = create_reasoner_llm(settings.llm)
-        except Exception as e:
-            print(f"Error creating LLM client: {e}")
+        llm = _create_llm_for_state(state)
+        if llm is None:
             state["task_envelope"] = None
             return state
 
         # Use LLM to select work item
-        result = _select_work_item_with_llm(state, llm)
+        return _apply_selection(state, _select_work_item_with_llm(state, llm))
 
-        if not result:
-            state["task_envelope"] = None
-            return state
 
-        wi, reasoning, message = result
+async def areason_step(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async Reasoner node: same as reason_step, but awaits the LLM call.
 
-        # Get repo info
-        repo = state["repos"].get(wi["repo_name"])
-        if not repo:
+    Lets callers run several independent selections concurrently
+    (e.g. with asyncio.gather) instead of paying each round-trip in turn.
+    Like reason_step it updates state in place, so concurrent calls each
+    need their own state dict.
+    """
+    with span("ReasonStep"):
+        llm = _create_llm_for_state(state)
+        if llm is None:
             state["task_envelope"] = None
             return state
 
-        # Create task envelope with LLM-generated message
-        envelope = {
-            "type": "desktop_task",
-            "intent": "harvest_and_nudge",
-            "target_repo_path": repo["path"],
-            "payload": {
-                "message_to_post": message,
-                "copy_scope": {"mode": "last_n", "n": 10}
-            },
-            "meta": {
-                "task_id": wi.get("id", wi.get("task_id")),
-                "repo_name": wi["repo_name"],
-                "reasoning": reasoning  # Include LLM's reasoning for observability
-            }
-        }
-
-        state["task_envelope"] = envelope
-
-        # Log reasoning for debugging
-        print(f"[Reasoner] Selected: {wi['repo_name']}/{wi.get('task_id')}")
-        print(f"[Reasoner] Reasoning: {reasoning}")
-
-        return state
+        # Use LLM to select work item
+        return _apply_selection(state, await _aselect_work_item_with_llm(state, llm))
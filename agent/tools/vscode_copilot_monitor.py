@@ -14,15 +14,26 @@ live MCP server.
 from __future__ import annotations
 
 import asyncio
+import atexit
 import json
 import os
 import difflib
 import logging
+import queue
+import re
+import sys
 import traceback
+from dataclasses import dataclass
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:  # Optional: orjson decodes large State-Tool payloads several times faster
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
 # Set up file-based logging
 log_dir = Path("logs")
 log_dir.mkdir(exist_ok=True)
@@ -33,14 +44,22 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 # File handler with detailed formatting
-file_handler = logging.FileHandler(log_file, encoding='utf-8')
+# delay=True: the log file is not opened until the first record is written
+file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
 file_handler.setLevel(logging.DEBUG)
 file_formatter = logging.Formatter(
     '%(asctime)s.%(msecs)03d | %(levelname)-8s | %(funcName)-20s | %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
+
+# File writes go through a queue drained by a listener thread so the
+# event loop driving the MCP session never blocks on disk I/O.
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(log_queue))
+queue_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+queue_listener.start()
+atexit.register(queue_listener.stop)
 
 # Console handler with simpler formatting
 console_handler = logging.StreamHandler()
@@ -53,6 +72,30 @@ logger.info(f"=== VS Code Monitor Session Started ===")
 logger.info(f"Log file: {log_file.absolute()}")
 
 
+# Window rows end in five fixed columns (Depth, Status, Width, Height, Handle);
+# everything before them is the title, which may itself contain spaces.
+_WINDOW_ROW_RE = re.compile(
+    r'^(?:(?P<title>.*?)\s+)?(?P<depth>\S+)\s+(?P<status>\S+)'
+    r'\s+(?P<width>-?\d+)\s+(?P<height>-?\d+)\s+(?P<handle>\S+)$'
+)
+
+# Substrings in the chat panel that mean Copilot is still producing output.
+_BUSY_INDICATORS = (
+    "generating...",
+    "thinking...",
+    "typing...",
+    "•••",
+    "...",
+)
+# One alternation scans the text once instead of once per indicator and
+# avoids lowercasing a copy of the whole transcript.
+_BUSY_RE = re.compile("|".join(map(re.escape, _BUSY_INDICATORS)), re.IGNORECASE)
+
+# Context lines around each change in the transcript/text diff previews.
+_DIFF_CONTEXT = 2
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@$")
+
+
 def parse_state_tool_text(text: str) -> Dict[str, Any]:
     """Parse State-Tool plain text output into structured data.
     
@@ -106,36 +149,25 @@ def parse_state_tool_text(text: str) -> Dict[str, Any]:
         
         # Parse window lines from apps section
         if in_apps_section:
-            parts = stripped.split()
-            
-            if len(parts) >= 5:
-                try:
-                    handle = parts[-1]
-                    height = int(parts[-2])
-                    width = int(parts[-3])
-                    status = parts[-4]
-                    depth = parts[-5]
-                    
-                    title_parts = parts[:-5]
-                    title = ' '.join(title_parts) if title_parts else 'Unknown'
-                    
-                    result['windows'].append({
-                        'title': title,
-                        'depth': depth,
-                        'status': status,
-                        'width': width,
-                        'height': height,
-                        'handle': handle,
-                        'x': 0,
-                        'y': 0,
-                    })
-                except (ValueError, IndexError) as e:
-                    logger.debug(f"Failed to parse window line: '{stripped}'. Error: {e}")
+            row = _WINDOW_ROW_RE.match(stripped)
+            if row is None:
+                logger.debug("Failed to parse window line: '%s' (unexpected column layout)", stripped)
+                continue
+
+            result['windows'].append({
+                'title': row['title'] or 'Unknown',
+                'depth': row['depth'],
+                'status': row['status'],
+                'width': int(row['width']),
+                'height': int(row['height']),
+                'handle': row['handle'],
+                'x': 0,
+                'y': 0,
+            })
         
         # Parse interactive elements (Name + Coordinates columns)
         elif in_interactive_section:
             # Look for coordinate tuples like (1234,5678)
-            import re
             coord_match = re.search(r'\((\d+),(\d+)\)', stripped)
             
             if coord_match:
@@ -161,14 +193,34 @@ def parse_state_tool_text(text: str) -> Dict[str, Any]:
                             'y': y,
                         })
                 except (ValueError, IndexError) as e:
-                    logger.debug(f"Failed to parse interactive element line: '{stripped}'. Error: {e}")
+                    logger.debug("Failed to parse interactive element line: '%s'. Error: %s", stripped, e)
     
     return result
 
 
+@dataclass(slots=True)
+class _HistoryEntry:
+    """Last-seen Copilot chat text and transcript for one VS Code window."""
+
+    copilot_text: str = ""
+    transcript: str = ""
+
+
 class VSCodeCopilotMonitor:
     """Monitor VS Code windows for Copilot Chat updates via Windows-MCP."""
 
+    # Fixed attribute set: no per-instance __dict__
+    __slots__ = (
+        "windows_mcp_path",
+        "command",
+        "command_args",
+        "busy_diff_threshold",
+        "win_session",
+        "history",
+        "screen_width",
+        "screen_height",
+    )
+
     def __init__(
         self,
         windows_mcp_path: Optional[str] = None,
@@ -189,7 +241,7 @@ class VSCodeCopilotMonitor:
         ]
         self.busy_diff_threshold = busy_diff_threshold
         self.win_session: Any = None
-        self.history: Dict[str, Dict[str, str]] = {}
+        self.history: Dict[str, _HistoryEntry] = {}
         self.screen_width = 1920
         self.screen_height = 1080
 
@@ -253,7 +305,9 @@ class VSCodeCopilotMonitor:
             initial_state = await self._get_state()
             self.screen_width = int(initial_state.get("screen_width", self.screen_width))
             self.screen_height = int(initial_state.get("screen_height", self.screen_height))
-            results = await self.check_all_windows()
+            # The desktop has not changed since this snapshot, so window
+            # discovery reuses it instead of a second State-Tool round-trip
+            results = await self.check_all_windows(initial_state)
             return results
         finally:
             self.win_session = None
@@ -272,14 +326,26 @@ class VSCodeCopilotMonitor:
                 if not text:
                     return {}
                 # First, try JSON
-                try:
-                    parsed = json.loads(text)
-                    if isinstance(parsed, dict):
-                        return parsed
-                except Exception:
-                    pass
+                parsed = None
+                if orjson is not None:
+                    try:
+                        parsed = orjson.loads(text)
+                    except orjson.JSONDecodeError:
+                        # orjson rejects NaN/Infinity and integers beyond
+                        # 64 bits; json below reads them back.
+                        pass
+                if parsed is None:
+                    try:
+                        parsed = json.loads(text)
+                    except ValueError:
+                        pass
+                if isinstance(parsed, dict):
+                    return parsed
                 # Fallback: parse structured plain text
-                return parse_state_tool_text(text)
+                # Parsing is pure CPU on tens of KB of text; keep it off the
+                # event loop so the stdio reader is not stalled meanwhile.
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, parse_state_tool_text, text)
             except Exception as exc:
                 if attempt == retries - 1:
                     print(f"Failed to get state after {retries} attempts: {exc}")
@@ -293,15 +359,20 @@ class VSCodeCopilotMonitor:
             "screen_height": self.screen_height,
         }
 
-    async def check_all_windows(self) -> List[Dict[str, Any]]:
-        """Check every VS Code window sequentially and return status dicts."""
+    async def check_all_windows(self, state: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Check every VS Code window sequentially and return status dicts.
+
+        ``state`` is a just-fetched desktop state to discover windows from;
+        when omitted a fresh one is requested.
+        """
 
         if self.win_session is None:
             raise RuntimeError("MCP session is not initialized")
 
         results: List[Dict[str, Any]] = []
         try:
-            state = await self._get_state()
+            if state is None:
+                state = await self._get_state()
             vscode_windows = self._filter_vscode_windows(state)
             print(f"Found {len(vscode_windows)} VS Code windows")
 
@@ -343,30 +414,35 @@ class VSCodeCopilotMonitor:
     async def _check_window(self, window: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Check Copilot text + transcript for a single VS Code window."""
 
-        title = window.get("title", "unknown")
+        # Interned titles hash once; the handle (when known) gives a short
+        # history key that stays stable when the active file changes.
+        title = sys.intern(window.get("title") or "unknown")
+        key = window.get("handle") or title
 
-        if title not in self.history:
-            self.history[title] = {"copilot_text": "", "transcript": ""}
+        entry = self.history.get(key)
+        if entry is None:
+            entry = self.history[key] = _HistoryEntry()
 
         await self._focus_window(window)
         fresh_state = await self._get_state()
 
         copilot_text = self._extract_copilot_text(fresh_state, window)
-        previous_text = self.history[title]["copilot_text"]
+        previous_text = entry.copilot_text
         text_diff = self._diff(previous_text, copilot_text)
         is_busy = self._is_busy(text_diff, copilot_text)
 
         transcript = await self._get_transcript(fresh_state)
-        previous_transcript = self.history[title]["transcript"]
+        previous_transcript = entry.transcript
         transcript_diff = self._diff(previous_transcript, transcript)
 
-        self.history[title]["copilot_text"] = copilot_text
-        self.history[title]["transcript"] = transcript
+        entry.copilot_text = copilot_text
+        entry.transcript = transcript
 
         self._print_status(title, is_busy, text_diff, transcript_diff)
 
         return {
             "title": title,
+            "key": key,
             "is_busy": is_busy,
             "text_diff": text_diff,
             "transcript_diff": transcript_diff,
@@ -388,18 +464,35 @@ class VSCodeCopilotMonitor:
                 return
             x = win_x + 50
             y = win_y + 15
-            await self.win_session.call_tool(
-                "Click-Tool",
-                {"loc": [x, y], "button": "left"},
-            )
-            await asyncio.sleep(0.5)
+            # The State-Tool read that follows only sees this window's chat once
+            # focus has landed, so the click settles fully before returning.
+            await self._click_and_settle({"loc": [x, y], "button": "left"}, 0.5)
         except Exception as exc:
             print(f"Warning: Could not focus window: {exc}")
 
+    async def _click_and_settle(
+        self, payload: Dict[str, Any], settle: float, overlap: bool = False
+    ) -> None:
+        """Send a Click-Tool call, then give the UI ``settle`` seconds to react.
+
+        With ``overlap`` the settle timer starts when the request is dispatched,
+        so the click costs ``max(rtt, settle)`` rather than ``rtt + settle``.
+        That leaves no settle time at all once the round-trip exceeds it, so it
+        is only for clicks whose follow-up does not depend on what they open.
+        """
+
+        if overlap:
+            await asyncio.gather(
+                self.win_session.call_tool("Click-Tool", payload),
+                asyncio.sleep(settle),
+            )
+            return
+        await self.win_session.call_tool("Click-Tool", payload)
+        await asyncio.sleep(settle)
+
     def _extract_copilot_text(self, state: Dict[str, Any], window: Dict[str, Any]) -> str:
         """Extract visible text from the approximate Copilot Chat region."""
 
-        textual = state.get("textual") or []
         window_x = float(window.get("x", 0) or 0)
         window_y = float(window.get("y", 0) or 0)
         window_width = float(window.get("width", 0) or 0)
@@ -414,23 +507,18 @@ class VSCodeCopilotMonitor:
         chat_area_left = window_right - (window_width * 0.4)
         window_bottom = window_y + window_height
 
-        copilot_texts: List[str] = []
-        for elem in textual:
-            if not isinstance(elem, dict):
-                continue
-            elem_x = elem.get("x")
-            elem_y = elem.get("y")
-            elem_text = elem.get("text")
-            if elem_x is None or elem_y is None or not elem_text:
-                continue
-            if (
-                window_x <= elem_x <= window_right
-                and window_y <= elem_y <= window_bottom
-                and elem_x >= chat_area_left
-            ):
-                copilot_texts.append(elem_text)
-
-        return "\n".join(copilot_texts)
+        # chat_area_left >= window_x, so it is the only left bound needed.
+        # A list (not a generator) lets join size the result in one pass.
+        return "\n".join([
+            elem["text"]
+            for elem in state.get("textual") or []
+            if isinstance(elem, dict)
+            and elem.get("text")
+            and elem.get("x") is not None
+            and elem.get("y") is not None
+            and chat_area_left <= elem["x"] <= window_right
+            and window_y <= elem["y"] <= window_bottom
+        ])
 
     async def _get_transcript(self, state: Dict[str, Any]) -> str:
         """Retrieve the Copilot transcript using "Copy All"."""
@@ -441,24 +529,17 @@ class VSCodeCopilotMonitor:
         try:
             copy_all_elem = self._find_element_by_text(state, "Copy All")
             if copy_all_elem:
-                await self.win_session.call_tool(
-                    "Click-Tool",
+                await self._click_and_settle(
                     {"loc": [copy_all_elem.get("x"), copy_all_elem.get("y")], "button": "left"},
+                    0.3,
                 )
-                await asyncio.sleep(0.3)
             else:
                 chat_x = int(self.screen_width * 0.8)
                 chat_y = int(self.screen_height * 0.5)
-                await self.win_session.call_tool(
-                    "Click-Tool",
-                    {"loc": [chat_x, chat_y], "button": "right"},
-                )
-                await asyncio.sleep(0.3)
-                await self.win_session.call_tool(
-                    "Click-Tool",
-                    {"loc": [chat_x, chat_y + 30], "button": "left"},
-                )
-                await asyncio.sleep(0.3)
+                # The context menu only exists after the right-click lands and
+                # has had time to open, so each click settles before the next.
+                await self._click_and_settle({"loc": [chat_x, chat_y], "button": "right"}, 0.3)
+                await self._click_and_settle({"loc": [chat_x, chat_y + 30], "button": "left"}, 0.3)
 
             clipboard_result = await self.win_session.call_tool(
                 "Powershell-Tool",
@@ -472,30 +553,28 @@ class VSCodeCopilotMonitor:
     def _find_element_by_text(self, state: Dict[str, Any], target_text: str) -> Optional[Dict[str, Any]]:
         """Find the first textual element that contains the provided text."""
 
-        textual = state.get("textual") or []
-        for elem in textual:
+        target_lower = target_text.lower()
+        for elem in state.get("textual") or []:
             if not isinstance(elem, dict):
                 continue
-            elem_text = elem.get("text", "")
-            if target_text.lower() in elem_text.lower():
+            elem_text = elem.get("text") or ""
+            if target_lower in elem_text.lower():
                 return elem
         return None
 
+    @staticmethod
+    def _has_busy_indicator(current_text: str) -> bool:
+        """Return True when the visible chat text shows a progress marker."""
+
+        return _BUSY_RE.search(current_text or "") is not None
+
     def _is_busy(self, text_diff: str, current_text: str) -> bool:
         """Infer whether Copilot is actively generating a reply."""
 
-        busy_indicators = [
-            "generating...",
-            "thinking...",
-            "typing...",
-            "•••",
-            "...",
-        ]
-
-        current_lower = (current_text or "").lower()
-        for indicator in busy_indicators:
-            if indicator in current_lower:
-                return True
+        # Indicators are decisive on their own; the diff length is only the
+        # fallback signal, so it is not consulted when one is present.
+        if self._has_busy_indicator(current_text):
+            return True
 
         return len(text_diff) > self.busy_diff_threshold
 
@@ -505,17 +584,47 @@ class VSCodeCopilotMonitor:
 
         old = old if isinstance(old, str) else str(old)
         new = new if isinstance(new, str) else str(new)
-        if not old and not new:
+        # Unchanged text is the common case between polls. str equality
+        # rejects on length before comparing bytes, so this skips difflib's
+        # line splitting and matching entirely.
+        if old == new:
             return ""
 
-        return "".join(
-            difflib.unified_diff(
-                old.splitlines(keepends=True),
-                new.splitlines(keepends=True),
-                n=2,
-                lineterm="",
-            )
+        old_lines = old.splitlines(keepends=True)
+        new_lines = new.splitlines(keepends=True)
+
+        # Transcripts mostly grow at the end, so strip the common head and
+        # tail in linear time and let difflib (quadratic in the worst case)
+        # match only the changed middle plus its context lines.
+        limit = min(len(old_lines), len(new_lines))
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        limit -= prefix
+        suffix = 0
+        while suffix < limit and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+            suffix += 1
+
+        start = max(prefix - _DIFF_CONTEXT, 0)
+        tail = max(suffix - _DIFF_CONTEXT, 0)
+        lines = difflib.unified_diff(
+            old_lines[start:len(old_lines) - tail],
+            new_lines[start:len(new_lines) - tail],
+            n=_DIFF_CONTEXT,
+            lineterm="",
         )
+        if start:
+            # Hunk ranges are relative to the slice; shift them back
+            lines = (
+                _HUNK_HEADER_RE.sub(
+                    lambda m: f"@@ -{int(m[1]) + start}{m[2] or ''} +{int(m[3]) + start}{m[4] or ''} @@",
+                    line,
+                )
+                if line.startswith("@@")
+                else line
+                for line in lines
+            )
+        return "".join(lines)
 
     @staticmethod
     def _extract_text(response: Any) -> str:
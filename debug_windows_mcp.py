@@ -3,129 +3,149 @@
 
 import asyncio
 import json
-import subprocess
 import sys
 from pathlib import Path
 
-async def test_direct_mcp():
-    """Test Windows-MCP directly via subprocess to see raw output."""
-    print("Testing Windows-MCP directly...")
-    print("-" * 60)
 
-    # Start Windows-MCP (use binary mode to avoid encoding issues)
-    process = subprocess.Popen(
-        ["uv", "--directory", "C:/Users/pmacl/Windows-MCP", "run", "main.py"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=False  # Binary mode to handle all characters
-    )
+def encode_frame(message: dict) -> bytes:
+    """Encode a JSON-RPC message as a newline-delimited UTF-8 frame."""
+    return (json.dumps(message) + '\n').encode('utf-8')
 
-    # Send initialize request
-    init_request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {
-                "name": "VSCodePiloter-Debug",
-                "version": "0.1.0"
-            }
+
+# The handshake and State-Tool requests never change, so their wire frames
+# are encoded once at import and written (and printed) as-is.
+INIT_FRAME = encode_frame({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {
+            "name": "VSCodePiloter-Debug",
+            "version": "0.1.0"
         }
     }
+})
+INITIALIZED_FRAME = encode_frame({
+    "jsonrpc": "2.0",
+    "method": "notifications/initialized",
+    "params": {}
+})
+STATE_FRAME = encode_frame({
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "tools/call",
+    "params": {
+        "name": "State-Tool",
+        "arguments": {}
+    }
+})
 
-    print(f"Sending: {json.dumps(init_request, indent=2)}")
-    process.stdin.write((json.dumps(init_request) + '\n').encode('utf-8'))
-    process.stdin.flush()
+# State-Tool replies arrive as one JSON line that can run to megabytes; the
+# StreamReader default of 64 KiB would make readline() raise on them.
+STDOUT_LIMIT = 16 * 2**20
 
-    # Read response
-    print("\nWaiting for response...")
-    response = process.stdout.readline()
-    print(f"Raw response: {response.decode('utf-8', errors='replace')}")
+async def test_direct_mcp():
+    """Test Windows-MCP directly via subprocess to see raw output."""
+    print("Testing Windows-MCP directly...")
+    print("-" * 60)
+
+    # Start Windows-MCP with non-blocking pipes so reads yield to the event loop
+    # (asyncio pipes are binary-only; read_line decodes each line exactly once)
+    process = await asyncio.create_subprocess_exec(
+        "uv", "--directory", "C:/Users/pmacl/Windows-MCP", "run", "main.py",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=STDOUT_LIMIT,
+    )
 
-    if response:
+    async def read_line(timeout: float = 5.0) -> str:
+        """Read and decode one stdout line, returning '' on EOF or timeout."""
         try:
-            parsed = json.loads(response.decode('utf-8', errors='replace'))
-            print(f"Parsed: {json.dumps(parsed, indent=2)}")
-        except json.JSONDecodeError as e:
-            print(f"JSON Error: {e}")
-
-    # Send initialized notification
-    init_notif = {
-        "jsonrpc": "2.0",
-        "method": "notifications/initialized",
-        "params": {}
-    }
+            raw = await asyncio.wait_for(process.stdout.readline(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"Timed out after {timeout}s waiting for output")
+            return ""
+        except ValueError as e:  # line longer than STDOUT_LIMIT
+            print(f"Line too long to read: {e}")
+            return ""
+        return raw.decode('utf-8', errors='replace')
 
-    print(f"\nSending notification: {json.dumps(init_notif, indent=2)}")
-    process.stdin.write((json.dumps(init_notif) + '\n').encode('utf-8'))
-    process.stdin.flush()
-
-    # Call State-Tool
-    state_request = {
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "tools/call",
-        "params": {
-            "name": "State-Tool",
-            "arguments": {}
-        }
-    }
+    try:
+        # Send initialize request
+        print(f"Sending: {INIT_FRAME.decode('utf-8').rstrip()}")
+        process.stdin.write(INIT_FRAME)
+        await process.stdin.drain()
 
-    print(f"\nCalling State-Tool: {json.dumps(state_request, indent=2)}")
-    process.stdin.write((json.dumps(state_request) + '\n').encode('utf-8'))
-    process.stdin.flush()
-
-    # Read State-Tool response
-    print("\nWaiting for State-Tool response...")
-    for _ in range(10):  # Try reading multiple lines
-        line = process.stdout.readline()
-        if line:
-            line_str = line.decode('utf-8', errors='replace').strip()
-            print(f"Line {_+1}: {line_str[:200]}...")  # Show first 200 chars
+        # Read response
+        print("\nWaiting for response...")
+        response = await read_line()
+        print(f"Raw response: {response}")
+
+        if response:
             try:
-                parsed = json.loads(line_str)
-                print(f"Parsed: {json.dumps(parsed, indent=2)[:500]}...")
-                if "result" in parsed:
-                    # Check if result has content
-                    result = parsed.get("result", {})
-                    if isinstance(result, dict) and "content" in result:
-                        content = result["content"]
-                        if isinstance(content, list) and len(content) > 0:
-                            text_item = content[0]
-                            if isinstance(text_item, dict) and "text" in text_item:
-                                state_text = text_item["text"]
-                                print(f"\nState-Tool returned text of length: {len(state_text)}")
-                                # Try parsing the text as JSON
-                                try:
-                                    state_data = json.loads(state_text)
-                                    print(f"State data keys: {list(state_data.keys())}")
-                                    if "windows" in state_data:
-                                        print(f"Found {len(state_data['windows'])} windows")
-                                        for w in state_data['windows'][:3]:  # Show first 3
-                                            print(f"  - {w.get('title', 'No title')}")
-                                except json.JSONDecodeError as e:
-                                    print(f"State text is not JSON: {e}")
-                                    print(f"First 200 chars: {state_text[:200]}")
-                    break
-            except json.JSONDecodeError:
-                pass
-        else:
-            break
-
-    # Check stderr for any errors
+                parsed = json.loads(response)
+                print(f"Parsed: {json.dumps(parsed, indent=2)}")
+            except json.JSONDecodeError as e:
+                print(f"JSON Error: {e}")
+
+        # Send initialized notification
+        print(f"\nSending notification: {INITIALIZED_FRAME.decode('utf-8').rstrip()}")
+        process.stdin.write(INITIALIZED_FRAME)
+        await process.stdin.drain()
+
+        # Call State-Tool
+        print(f"\nCalling State-Tool: {STATE_FRAME.decode('utf-8').rstrip()}")
+        process.stdin.write(STATE_FRAME)
+        await process.stdin.drain()
+
+        # Read State-Tool response
+        print("\nWaiting for State-Tool response...")
+        for _ in range(10):  # Try reading multiple lines
+            line = await read_line()
+            if line:
+                line_str = line.strip()
+                print(f"Line {_+1}: {line_str[:200]}...")  # Show first 200 chars
+                try:
+                    parsed = json.loads(line_str)
+                    print(f"Parsed: {json.dumps(parsed, indent=2)[:500]}...")
+                    if "result" in parsed:
+                        # Check if result has content
+                        result = parsed.get("result", {})
+                        if isinstance(result, dict) and "content" in result:
+                            content = result["content"]
+                            if isinstance(content, list) and len(content) > 0:
+                                text_item = content[0]
+                                if isinstance(text_item, dict) and "text" in text_item:
+                                    state_text = text_item["text"]
+                                    print(f"\nState-Tool returned text of length: {len(state_text)}")
+                                    # Try parsing the text as JSON
+                                    try:
+                                        state_data = json.loads(state_text)
+                                        print(f"State data keys: {list(state_data.keys())}")
+                                        if "windows" in state_data:
+                                            print(f"Found {len(state_data['windows'])} windows")
+                                            for w in state_data['windows'][:3]:  # Show first 3
+                                                print(f"  - {w.get('title', 'No title')}")
+                                    except json.JSONDecodeError as e:
+                                        print(f"State text is not JSON: {e}")
+                                        print(f"First 200 chars: {state_text[:200]}")
+                        break
+                except json.JSONDecodeError:
+                    pass
+            else:
+                break
+    finally:
+        # Cleanup, then collect stderr once the pipes reach EOF
+        if process.returncode is None:
+            process.terminate()
+        _, stderr_output = await process.communicate()
+
     print("\nChecking stderr...")
-    process.poll()
-    if process.stderr:
-        stderr_output = process.stderr.read()
-        if stderr_output:
-            print(f"Stderr: {stderr_output}")
-
-    # Cleanup
-    process.terminate()
-    process.wait()
+    if stderr_output:
+        print(f"Stderr: {stderr_output}")
     print("\nTest complete.")
 
 async def test_with_mcp_sdk():
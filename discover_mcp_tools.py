@@ -2,95 +2,207 @@
 """Discover available tools from Windows-MCP."""
 
 import asyncio
+import atexit
 import json
 import subprocess
-import sys
+
+try:  # orjson is optional; the stdlib codec is used when it is missing
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_frame(message: dict) -> bytes:
+    """Encode a JSON-RPC message as a newline-terminated UTF-8 frame."""
+    if orjson is not None:
+        return orjson.dumps(message) + b'\n'
+    return (json.dumps(message) + '\n').encode('utf-8')
+
+
+def loads_frame(frame: bytes):
+    """Decode one JSON-RPC frame straight from bytes."""
+    if orjson is not None:
+        return orjson.loads(frame)
+    return json.loads(frame)
+
+
+WINDOWS_MCP_COMMAND = ["uv", "--directory", "C:/Users/pmacl/Windows-MCP", "run", "main.py"]
+
+
+class ToolDiscoverer:
+    """A long-lived Windows-MCP process that answers tools/list on demand.
+
+    `uv run` plus server start-up costs seconds, so the process is spawned
+    and initialized once and reused for every discovery; it is terminated
+    at interpreter exit. Its stderr is discarded, since nothing reads it
+    and a full pipe would stall the server.
+    """
+
+    def __init__(self, command=None):
+        # Binary pipes: JSON-RPC frames are written and parsed as bytes,
+        # skipping the text layer's decode/encode per message
+        self.process = subprocess.Popen(
+            command or WINDOWS_MCP_COMMAND,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._eof = False
+        self._last_id = 0
+        self._responses = {}
+        self._buffer = bytearray()
+        self._init_response = None
+        atexit.register(self.close)
+
+        # Send initialize + initialized in one write without waiting; the
+        # first tools/list goes out right behind them and the server handles
+        # stdin in order, so the whole handshake is pipelined.
+        self._init_id = self._next_id()
+        self._write(
+            {
+                "jsonrpc": "2.0",
+                "id": self._init_id,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2024-11-05",
+                    "capabilities": {},
+                    "clientInfo": {
+                        "name": "Tool-Discoverer",
+                        "version": "0.1.0"
+                    }
+                }
+            },
+            {
+                "jsonrpc": "2.0",
+                "method": "notifications/initialized",
+                "params": {}
+            },
+        )
+
+    @property
+    def init_response(self):
+        """The server's initialize response (read on first access)."""
+        if self._init_response is None:
+            self._init_response = self._read_response(self._init_id)
+        return self._init_response
+
+    def list_tools(self):
+        """Send tools/list and return the raw JSON-RPC response (None on EOF)."""
+        request_id = self._next_id()
+        self._write({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/list",
+            "params": {}
+        })
+        return self._read_response(request_id)
+
+    @property
+    def alive(self):
+        """True while the server is running and its stdout is still open."""
+        return not self._eof and self.process.poll() is None
+
+    def close(self):
+        """Terminate the server process if it is still running."""
+        if self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait()
+
+    def _next_id(self):
+        self._last_id += 1
+        return self._last_id
+
+    def _write(self, *messages):
+        self.process.stdin.write(b"".join(dumps_frame(message) for message in messages))
+        self.process.stdin.flush()
+
+    def _read_frame(self):
+        """Return the next newline-delimited frame from stdout, or None on EOF.
+
+        Reads whatever the pipe has (up to 64 KiB) with read1 and slices
+        frames out of a local buffer, so several responses arriving in one
+        chunk are handed out without going back to the kernel.
+        """
+        buf = self._buffer
+        while True:
+            end = buf.find(b"\n")
+            if end >= 0:
+                frame = bytes(buf[:end])
+                del buf[:end + 1]
+                return frame
+            chunk = self.process.stdout.read1(65536)
+            if not chunk:
+                self._eof = True
+                return None
+            buf += chunk
+
+    def _read_response(self, request_id):
+        """Read stdout until the response for request_id arrives.
+
+        Responses to other ids seen on the way are kept for later callers.
+        Server-to-client requests (which carry a "method" alongside their
+        own "id") and notifications are skipped.
+        """
+        while request_id not in self._responses:
+            frame = self._read_frame()
+            if frame is None:
+                return None
+            try:
+                message = loads_frame(frame)
+            except ValueError:  # json and orjson decode errors both subclass it
+                continue
+            if isinstance(message, dict) and "id" in message and "method" not in message:
+                self._responses[message["id"]] = message
+        return self._responses.pop(request_id)
+
+
+_discoverer = None
+
+
+def get_discoverer():
+    """Return the shared ToolDiscoverer, (re)starting Windows-MCP as needed.
+
+    A discoverer whose server has exited or closed stdout is replaced, so a
+    crashed server costs one restart instead of a BrokenPipeError.
+    """
+    global _discoverer
+    if _discoverer is None or not _discoverer.alive:
+        if _discoverer is not None:
+            _discoverer.close()
+        _discoverer = ToolDiscoverer()
+    return _discoverer
+
 
 async def discover_tools():
     """Discover available tools from Windows-MCP."""
     print("Discovering tools from Windows-MCP...")
     print("-" * 50)
 
-    # Start Windows-MCP
-    process = subprocess.Popen(
-        ["uv", "--directory", "C:/Users/pmacl/Windows-MCP", "run", "main.py"],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-
-    # Send initialize request
-    init_request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {
-                "name": "Tool-Discoverer",
-                "version": "0.1.0"
-            }
-        }
-    }
-
-    print("Sending initialize...")
-    process.stdin.write(json.dumps(init_request) + '\n')
-    process.stdin.flush()
-
-    # Read response
-    response = process.stdout.readline()
-    print(f"Initialize response: {response.strip()}")
-
-    # Send initialized notification
-    notif = {
-        "jsonrpc": "2.0",
-        "method": "notifications/initialized",
-        "params": {}
-    }
-    process.stdin.write(json.dumps(notif) + '\n')
-    process.stdin.flush()
-
-    # Send tools/list request
-    tools_request = {
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "tools/list",
-        "params": {}
-    }
+    discoverer = get_discoverer()
 
     print("Requesting tools list...")
-    process.stdin.write(json.dumps(tools_request) + '\n')
-    process.stdin.flush()
-
-    # Read tools response
-    tools_response = process.stdout.readline()
-    print(f"Tools response: {tools_response.strip()}")
-
-    try:
-        parsed = json.loads(tools_response)
-        if "result" in parsed and "tools" in parsed["result"]:
-            tools = parsed["result"]["tools"]
-            print(f"\nFound {len(tools)} tools:")
-            for tool in tools:
-                print(f"  - {tool.get('name', 'Unknown')}")
-                if "description" in tool:
-                    print(f"    {tool['description']}")
-                if "inputSchema" in tool:
-                    schema = tool["inputSchema"]
-                    if "properties" in schema:
-                        props = schema["properties"]
-                        print(f"    Parameters: {list(props.keys())}")
-                        for prop_name, prop_info in props.items():
-                            prop_type = prop_info.get("type", "unknown")
-                            print(f"      {prop_name}: {prop_type}")
-    except json.JSONDecodeError as e:
-        print(f"Failed to parse tools response: {e}")
-
-    # Cleanup
-    process.terminate()
-    process.wait()
+    parsed = discoverer.list_tools()
+
+    print(f"Initialize response: {json.dumps(discoverer.init_response)}")
+    print(f"Tools response: {json.dumps(parsed)}")
+
+    if parsed is None:
+        print("Failed to read tools response")
+    elif "result" in parsed and "tools" in parsed["result"]:
+        tools = parsed["result"]["tools"]
+        print(f"\nFound {len(tools)} tools:")
+        for tool in tools:
+            print(f"  - {tool.get('name', 'Unknown')}")
+            if "description" in tool:
+                print(f"    {tool['description']}")
+            if "inputSchema" in tool:
+                schema = tool["inputSchema"]
+                if "properties" in schema:
+                    props = schema["properties"]
+                    print(f"    Parameters: {list(props.keys())}")
+                    for prop_name, prop_info in props.items():
+                        prop_type = prop_info.get("type", "unknown")
+                        print(f"      {prop_name}: {prop_type}")
 
 if __name__ == "__main__":
-    asyncio.run(discover_tools())
\ No newline at end of file
+    asyncio.run(discover_tools())
@@ -11,12 +11,6 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from agent.diagnostics.monitor_summary import (  # noqa: E402
-    compute_window_stats,
-    latest_summary_path,
-    load_summary,
-)
-
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
@@ -36,6 +30,14 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv)
+
+    # Deferred so argument errors and --help never import the agent package
+    from agent.diagnostics.monitor_summary import (
+        compute_window_stats,
+        latest_summary_path,
+        load_summary,
+    )
+
     summary_path = args.summary
     if summary_path is None:
         summary_path = latest_summary_path(args.logs)
@@ -47,24 +49,25 @@ def main(argv: list[str] | None = None) -> int:
     summary = load_summary(summary_path)
     stats = compute_window_stats(summary)
 
-    print(f"Summary: {summary_path}")
-    print(f"Log file: {summary.get('log_path')}")
-    print(f"Screenshots: {summary.get('screenshot_dir')}")
-    print()
-    print(f"Windows processed: {stats['window_count']}")
-    print(f"Busy windows: {stats['busy_windows']} | Ready windows: {stats['ready_windows']}")
-    print(f"Screenshots missing: {stats['screenshots_missing']}")
-    print()
-    print("Timings (ms):")
-    print(
+    # Build the whole report and emit it with one write instead of a
+    # print (lock + flush) per line
+    lines = [
+        f"Summary: {summary_path}",
+        f"Log file: {summary.get('log_path')}",
+        f"Screenshots: {summary.get('screenshot_dir')}",
+        "",
+        f"Windows processed: {stats['window_count']}",
+        f"Busy windows: {stats['busy_windows']} | Ready windows: {stats['ready_windows']}",
+        f"Screenshots missing: {stats['screenshots_missing']}",
+        "",
+        "Timings (ms):",
         f"  Focus avg={stats['avg_focus_ms']} | State avg={stats['avg_state_ms']} | "
-        f"Transcript avg={stats['avg_transcript_ms']}"
-    )
-    print("Characters:")
-    print(
+        f"Transcript avg={stats['avg_transcript_ms']}",
+        "Characters:",
         f"  Copilot avg={stats['avg_copilot_chars']} max={stats['max_copilot_chars']} | "
-        f"Transcript avg={stats['avg_transcript_chars']} max={stats['max_transcript_chars']}"
-    )
+        f"Transcript avg={stats['avg_transcript_chars']} max={stats['max_transcript_chars']}",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
     return 0
 
 
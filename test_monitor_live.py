@@ -13,13 +13,29 @@ Requirements:
 import asyncio
 import os
 import sys
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 
 # Add parent directory to path to import our module
 sys.path.insert(0, str(Path(__file__).parent))
 
-from agent.tools.vscode_copilot_monitor_debug import VSCodeCopilotMonitor
+
+def window_group(title):
+    """Group key for a VS Code title: the workspace segment when present.
+
+    "CLAUDE.md - E:\\_OneOffs\\VSCodePiloter - Visual Studio Code" groups as
+    "E:\\_OneOffs\\VSCodePiloter"; titles without that shape group as-is.
+    """
+    parts = title.split(" - ")
+    return parts[-2] if len(parts) >= 3 else parts[0]
+
+
+# Resolved once per process: Path.home() may hit the registry on Windows and
+# exists() is a stat() call, neither of which changes between runs
+WINDOWS_MCP_PATH = os.environ.get("WINDOWS_MCP_PATH") or str(Path.home() / "Windows-MCP")
+WINDOWS_MCP_PATH_EXISTS = Path(WINDOWS_MCP_PATH).exists()
+
 
 async def test_monitor():
     """Run monitor test with detailed output."""
@@ -30,17 +46,21 @@ async def test_monitor():
     print()
 
     # Check environment
-    windows_mcp_path = os.environ.get("WINDOWS_MCP_PATH") or str(Path.home() / "Windows-MCP")
+    windows_mcp_path = WINDOWS_MCP_PATH
 
     print(f"Windows-MCP Path: {windows_mcp_path}")
 
-    if not Path(windows_mcp_path).exists():
+    if not WINDOWS_MCP_PATH_EXISTS:
         print(f"⚠️  WARNING: Path {windows_mcp_path} does not exist!")
         print("   Set WINDOWS_MCP_PATH environment variable to correct location")
 
     print()
     print("Creating monitor instance...")
 
+    # Imported here, not at module level: the debug monitor opens its log
+    # file and logging thread on import, which collection/--help should not pay for
+    from agent.tools.vscode_copilot_monitor_debug import VSCodeCopilotMonitor
+
     # Create monitor
     monitor = VSCodeCopilotMonitor(
         windows_mcp_path=windows_mcp_path,
@@ -68,24 +88,25 @@ async def test_monitor():
             print(f"✅ Checked {len(results)} VS Code windows")
             print()
 
-            for i, result in enumerate(results, 1):
-                print(f"Window {i}:")
-                print(f"  Title: {result.get('title', 'unknown')}")
+            # Many windows share a workspace, so report one line per
+            # workspace and spell out only the windows that errored
+            groups = defaultdict(list)
+            for result in results:
+                groups[window_group(result.get("title", "unknown"))].append(result)
+
+            for group, members in groups.items():
+                busy = sum(1 for r in members if r.get("is_busy"))
+                errors = [r for r in members if r.get("error")]
+                copilot_chars = sum(r.get("copilot_text_length", 0) for r in members)
+                transcript_chars = sum(r.get("transcript_length", 0) for r in members)
+                print(
+                    f"{group}: {len(members)} windows, {busy} busy, {len(errors)} errors | "
+                    f"Copilot chars={copilot_chars} Transcript chars={transcript_chars}"
+                )
+                for r in errors:
+                    print(f"  ❌ {r.get('title', 'unknown')}: {r['error']}")
 
-                if result.get("error"):
-                    print(f"  ❌ ERROR: {result['error']}")
-                else:
-                    print(f"  Status: {'🔴 BUSY' if result.get('is_busy') else '🟢 READY'}")
-                    print(f"  Copilot text length: {result.get('copilot_text_length', 0)}")
-                    print(f"  Transcript length: {result.get('transcript_length', 0)}")
-
-                    if result.get("text_diff"):
-                        print(f"  Text changes: {len(result['text_diff'])} chars")
-
-                    if result.get("transcript_diff"):
-                        print(f"  Transcript changes: {len(result['transcript_diff'])} chars")
-
-                print()
+            print()
 
         # Check log file
         log_dir = Path("logs")
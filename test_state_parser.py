@@ -2,9 +2,46 @@
 """Test parsing State-Tool output."""
 
 import re
+from typing import Iterable, Union
 
-def parse_state_tool_output(text: str) -> dict:
-    """Parse the text output from State-Tool into structured data."""
+# Table header: first column "Name", with "Depth" and "Status" later on the line
+_HEADER_RE = re.compile(r'^\s*Name(?=.*Depth)(?=.*Status)')
+
+# Columns in the State-Tool table are separated by runs of 2+ whitespace
+_COL_RE = re.compile(r'\s{2,}')
+
+# ASCII whitespace other than the plain space that _COL_RE also splits on
+_OTHER_ASCII_SPACE = '\t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+def split_columns(line: str) -> list:
+    """Split a table row on runs of two or more whitespace characters.
+
+    Walks the row with str.find instead of the regex engine. Rows holding
+    any other whitespace (tabs, non-ASCII spaces such as U+00A0) fall back
+    to _COL_RE so the result always matches it.
+    """
+    if not line.isascii() or any(ch in line for ch in _OTHER_ASCII_SPACE):
+        return _COL_RE.split(line)
+
+    parts = []
+    start = 0
+    n = len(line)
+    while True:
+        gap = line.find('  ', start)
+        if gap < 0:
+            parts.append(line[start:])
+            return parts
+        parts.append(line[start:gap])
+        start = gap + 2
+        while start < n and line[start] == ' ':
+            start += 1
+
+def parse_state_tool_output(text: Union[str, Iterable[str]]) -> dict:
+    """Parse the text output from State-Tool into structured data.
+
+    Accepts the full text or any iterable of lines (e.g. a subprocess's
+    stdout) and makes a single forward pass over it.
+    """
     result = {
         "windows": [],
         "textual": [],
@@ -12,30 +49,33 @@ def parse_state_tool_output(text: str) -> dict:
         "screen_height": 1080,
     }
 
-    # Find the table section
-    lines = text.split('\n')
-    table_start = None
-    for i, line in enumerate(lines):
-        if line.strip().startswith('Name') and 'Depth' in line and 'Status' in line:
-            table_start = i
-            break
+    lines = iter(text.splitlines() if isinstance(text, str) else text)
 
-    if table_start is None:
+    # Find the table header; the rows are consumed from the same iterator
+    for line in lines:
+        if _HEADER_RE.match(line):
+            break
+    else:
         return result
 
     # Skip the separator line
-    data_start = table_start + 2
+    next(lines, None)
 
     # Parse each window row
-    for line in lines[data_start:]:
-        line = line.strip()
-        if not line or line.startswith('-'):
+    for line in lines:
+        if not line or line.isspace():
+            continue
+        # Only pay for strip() when the row is actually padded (or ends in
+        # a newline when streamed); clean rows are used as-is
+        if line[0].isspace() or line[-1].isspace():
+            line = line.strip()
+        if line[0] == '-':
             continue
 
         # Split by multiple spaces, but preserve the name which may have spaces
         # The columns seem to be: Name (long), Depth, Status, Width, Height, Handle
-        # Use regex to split on 2+ spaces
-        parts = re.split(r'\s{2,}', line)
+        # split_columns splits on runs of 2+ spaces (see _COL_RE)
+        parts = split_columns(line)
         if len(parts) >= 6:
             try:
                 name = parts[0]
@@ -64,8 +104,12 @@ def parse_state_tool_output(text: str) -> dict:
 
     return result
 
-# Test with sample data
-sample_text = """Default Language of User:
+
+if __name__ == "__main__":
+    import json
+
+    # Test with sample data
+    sample_text = """Default Language of User:
     English (United States) with encoding: cp1252
 
     Focused App:
@@ -74,7 +118,6 @@ sample_text = """Default Language of User:
 CLAUDE.md - E:\\_OneOffs\\VSCodePiloter - Visual Studio Code - Pending                           1  Pending     1920     1040    0x0000000000A00E1A
 """
 
-parsed = parse_state_tool_output(sample_text)
-print("Parsed result:")
-import json
-print(json.dumps(parsed, indent=2))
\ No newline at end of file
+    parsed = parse_state_tool_output(sample_text)
+    print("Parsed result:")
+    print(json.dumps(parsed, indent=2))
@@ -15,31 +15,57 @@ Performance targets:
 - Full work item execution: <10s
 - Graph execution: <15s
 """
+import asyncio
 import pytest
 import time
-import statistics
+from contextlib import closing
 from typing import List, Dict, Any
 import os
 
 
 def timeit(func, *args, **kwargs) -> float:
     """Time a function execution and return elapsed time in seconds."""
-    start = time.time()
+    start = time.perf_counter_ns()
     func(*args, **kwargs)
-    return time.time() - start
+    return (time.perf_counter_ns() - start) / 1e9
 
 
-def calculate_stats(times: List[float]) -> Dict[str, float]:
-    """Calculate statistics for a list of timing measurements."""
+def calculate_stats(times_ns: List[int]) -> Dict[str, float]:
+    """Calculate statistics in seconds from perf_counter_ns() measurements.
+
+    Sorts once and reads every statistic from the sorted list; the
+    nanosecond integers are only converted to seconds here.
+    """
+    ordered = sorted(times_ns)
+    n = len(ordered)
+    mid = n // 2
+    median_ns = ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) / 2
     return {
-        "avg": statistics.mean(times),
-        "min": min(times),
-        "max": max(times),
-        "p95": sorted(times)[int(len(times) * 0.95)] if len(times) > 1 else times[0],
-        "median": statistics.median(times)
+        "avg": sum(ordered) / n / 1e9,
+        "min": ordered[0] / 1e9,
+        "max": ordered[-1] / 1e9,
+        "p95": ordered[int(n * 0.95)] / 1e9,
+        "median": median_ns / 1e9,
     }
 
 
+@pytest.fixture(scope="module")
+def stdio_adapter():
+    """One Windows-MCP stdio server shared by every MCP benchmark in this module."""
+    from agent.adapters.stdio_mcp_adapter import StdioMCPAdapter
+
+    try:
+        adapter = StdioMCPAdapter(
+            command="npx",
+            args=["-y", "@curtsortouch/windows-mcp"]
+        )
+    except Exception as e:
+        pytest.skip(f"MCP adapter not available: {e}")
+
+    with closing(adapter):
+        yield adapter
+
+
 @pytest.mark.benchmark
 @pytest.mark.requires_api_key
 def test_llm_reasoning_latency():
@@ -71,11 +97,11 @@ def test_llm_reasoning_latency():
 
     times = []
     for i in range(5):
-        start = time.time()
+        start = time.perf_counter_ns()
         response = llm.invoke([test_message])
-        elapsed = time.time() - start
+        elapsed = time.perf_counter_ns() - start
         times.append(elapsed)
-        print(f"  Run {i+1}: {elapsed:.2f}s")
+        print(f"  Run {i+1}: {elapsed / 1e9:.2f}s")
 
     stats = calculate_stats(times)
 
@@ -96,105 +122,117 @@ def test_llm_reasoning_latency():
 
 @pytest.mark.benchmark
 @pytest.mark.integration
-def test_mcp_adapter_operation_time():
+def test_mcp_adapter_operation_time(stdio_adapter):
     """
     Benchmark MCP adapter operations.
     Target: <500ms average
     """
-    from agent.adapters.stdio_mcp_adapter import StdioMCPAdapter
+    adapter = stdio_adapter
 
-    try:
-        adapter = StdioMCPAdapter(
-            command="npx",
-            args=["-y", "@curtsortouch/windows-mcp"]
-        )
-    except Exception as e:
-        pytest.skip(f"MCP adapter not available: {e}")
+    # Benchmark list_windows
+    times = []
+    for i in range(10):
+        start = time.perf_counter_ns()
+        windows = adapter.list_windows()
+        elapsed = time.perf_counter_ns() - start
+        times.append(elapsed)
 
-    try:
-        # Benchmark list_windows
-        times = []
-        for i in range(10):
-            start = time.time()
-            windows = adapter.list_windows()
-            elapsed = time.time() - start
-            times.append(elapsed)
+    stats = calculate_stats(times)
 
-        stats = calculate_stats(times)
+    # Same calls with all 10 requests in flight at once (one pipe write)
+    start = time.perf_counter_ns()
+    adapter.call_tools_pipelined([("list_windows", {})] * 10)
+    pipelined_per_op = (time.perf_counter_ns() - start) / 10 / 1e9
 
-        print(f"\nMCP list_windows Operation Time:")
-        print(f"  Average: {stats['avg']*1000:.0f}ms")
-        print(f"  Min: {stats['min']*1000:.0f}ms")
-        print(f"  Max: {stats['max']*1000:.0f}ms")
-        print(f"  P95: {stats['p95']*1000:.0f}ms")
+    print(f"\nMCP list_windows Operation Time:")
+    print(f"  Average: {stats['avg']*1000:.0f}ms")
+    print(f"  Min: {stats['min']*1000:.0f}ms")
+    print(f"  Max: {stats['max']*1000:.0f}ms")
+    print(f"  P95: {stats['p95']*1000:.0f}ms")
+    print(f"  Pipelined (10 in flight): {pipelined_per_op*1000:.0f}ms/op")
 
-        # Relaxed target for MCP operations (stdio has overhead)
-        assert stats['avg'] < 2.0, f"Average MCP operation time {stats['avg']*1000:.0f}ms exceeds relaxed target of 2000ms"
+    # Relaxed target for MCP operations (stdio has overhead)
+    assert stats['avg'] < 2.0, f"Average MCP operation time {stats['avg']*1000:.0f}ms exceeds relaxed target of 2000ms"
 
-        if stats['avg'] < 0.5:
-            print(f"  ✓ Meets target of <500ms")
-        else:
-            print(f"  ⚠ Exceeds target of <500ms (relaxed to 2000ms for stdio)")
+    if stats['avg'] < 0.5:
+        print(f"  ✓ Meets target of <500ms")
+    else:
+        print(f"  ⚠ Exceeds target of <500ms (relaxed to 2000ms for stdio)")
 
-    finally:
-        if hasattr(adapter, 'close'):
-            adapter.close()
+
+@pytest.mark.benchmark
+@pytest.mark.integration
+def test_mcp_adapter_concurrent_throughput(stdio_adapter):
+    """
+    Benchmark list_windows throughput with 10 calls in flight at once.
+    Complements the serial latency benchmark above: wall time should
+    approach one round-trip rather than ten.
+    """
+    adapter = stdio_adapter
+
+    async def timed_call() -> int:
+        start = time.perf_counter_ns()
+        await asyncio.to_thread(adapter.list_windows)
+        return time.perf_counter_ns() - start
+
+    async def run_concurrently(n: int):
+        start = time.perf_counter_ns()
+        times = await asyncio.gather(*(timed_call() for _ in range(n)))
+        return (time.perf_counter_ns() - start) / 1e9, list(times)
+
+    wall, times = asyncio.run(run_concurrently(10))
+    stats = calculate_stats(times)
+
+    print(f"\nMCP list_windows Concurrent Throughput (10 in flight):")
+    print(f"  Wall time: {wall*1000:.0f}ms ({10 / wall:.1f} ops/s)")
+    print(f"  Per-call average: {stats['avg']*1000:.0f}ms")
+    print(f"  P95: {stats['p95']*1000:.0f}ms")
+
+    assert stats['avg'] < 2.0, f"Average concurrent MCP call time {stats['avg']*1000:.0f}ms exceeds relaxed target of 2000ms"
 
 
 @pytest.mark.benchmark
 @pytest.mark.integration
 @pytest.mark.requires_vscode
-def test_screenshot_capture_time():
+def test_screenshot_capture_time(stdio_adapter):
     """
     Benchmark screenshot capture time.
     Target: <1s average
     """
-    from agent.adapters.stdio_mcp_adapter import StdioMCPAdapter
     from agent.nodes.act_step import _find_vscode_window
 
-    try:
-        adapter = StdioMCPAdapter(
-            command="npx",
-            args=["-y", "@curtsortouch/windows-mcp"]
-        )
-    except Exception as e:
-        pytest.skip(f"MCP adapter not available: {e}")
-
-    try:
-        # Find a window to screenshot
-        window = _find_vscode_window(adapter, ".*Visual Studio Code.*")
-        if not window:
-            pytest.skip("No VS Code window found")
+    adapter = stdio_adapter
 
-        hwnd = window.get("hwnd") or window.get("id")
+    # Find a window to screenshot
+    window = _find_vscode_window(adapter, ".*Visual Studio Code.*")
+    if not window:
+        pytest.skip("No VS Code window found")
 
-        # Benchmark screenshot
-        times = []
-        for i in range(10):
-            start = time.time()
-            screenshot = adapter.screenshot(hwnd=hwnd)
-            elapsed = time.time() - start
-            times.append(elapsed)
-            assert len(screenshot) > 1000, "Screenshot should have content"
+    hwnd = window.get("hwnd") or window.get("id")
 
-        stats = calculate_stats(times)
+    # Benchmark screenshot
+    times = []
+    for i in range(10):
+        start = time.perf_counter_ns()
+        screenshot = adapter.screenshot(hwnd=hwnd)
+        elapsed = time.perf_counter_ns() - start
+        times.append(elapsed)
+        assert len(screenshot) > 1000, "Screenshot should have content"
 
-        print(f"\nScreenshot Capture Time:")
-        print(f"  Average: {stats['avg']*1000:.0f}ms")
-        print(f"  Min: {stats['min']*1000:.0f}ms")
-        print(f"  Max: {stats['max']*1000:.0f}ms")
-        print(f"  P95: {stats['p95']*1000:.0f}ms")
+    stats = calculate_stats(times)
 
-        assert stats['avg'] < 2.0, f"Average screenshot time {stats['avg']*1000:.0f}ms exceeds relaxed target of 2000ms"
+    print(f"\nScreenshot Capture Time:")
+    print(f"  Average: {stats['avg']*1000:.0f}ms")
+    print(f"  Min: {stats['min']*1000:.0f}ms")
+    print(f"  Max: {stats['max']*1000:.0f}ms")
+    print(f"  P95: {stats['p95']*1000:.0f}ms")
 
-        if stats['avg'] < 1.0:
-            print(f"  ✓ Meets target of <1s")
-        else:
-            print(f"  ⚠ Exceeds target of <1s (relaxed to 2s)")
+    assert stats['avg'] < 2.0, f"Average screenshot time {stats['avg']*1000:.0f}ms exceeds relaxed target of 2000ms"
 
-    finally:
-        if hasattr(adapter, 'close'):
-            adapter.close()
+    if stats['avg'] < 1.0:
+        print(f"  ✓ Meets target of <1s")
+    else:
+        print(f"  ⚠ Exceeds target of <1s (relaxed to 2s)")
 
 
 @pytest.mark.benchmark
@@ -241,12 +279,12 @@ def test_reasoner_node_execution_time():
 
     times = []
     for i in range(3):
-        start = time.time()
+        start = time.perf_counter_ns()
         result = reason_step(state.copy())
-        elapsed = time.time() - start
+        elapsed = time.perf_counter_ns() - start
         times.append(elapsed)
         assert result.get("task_envelope") is not None
-        print(f"  Run {i+1}: {elapsed:.2f}s")
+        print(f"  Run {i+1}: {elapsed / 1e9:.2f}s")
 
     stats = calculate_stats(times)
 
@@ -283,11 +321,15 @@ def test_graph_node_overhead():
         }
     }
 
+    # sync_plan only rebinds top-level keys ("plan", "work_items"), so a
+    # shallow copy per run is enough; build them outside the timed region
+    states = [state.copy() for _ in range(50)]
+
     times = []
-    for i in range(50):
-        start = time.time()
-        result = sync_plan(state.copy())
-        elapsed = time.time() - start
+    for run_state in states:
+        start = time.perf_counter_ns()
+        result = sync_plan(run_state)
+        elapsed = time.perf_counter_ns() - start
         times.append(elapsed)
 
     stats = calculate_stats(times)
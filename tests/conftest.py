@@ -1,37 +1,87 @@
 import os
+from pathlib import Path
+
 import pytest
 
 ACCEPTANCE_ENV = "RUN_ACCEPTANCE"
 INTEGRATION_ENV = "RUN_INTEGRATION"
 
+ACCEPTANCE = pytest.mark.acceptance
+INTEGRATION = pytest.mark.integration
+UNIT = pytest.mark.unit
+MCP = pytest.mark.mcp
+
+# Z.ai per-key concurrency budget for parallel (pytest-xdist) runs
+ZAI_MAX_CONCURRENT_ENV = "ZAI_MAX_CONCURRENT"
+
+# The API-backed (requires_api_key) tests all live under this directory
+API_TESTS_DIR = Path(__file__).parent / "integration"
+
+SKIP_ACCEPTANCE = pytest.mark.skip(reason=f"acceptance tests require {ACCEPTANCE_ENV}=1")
+SKIP_INTEGRATION = pytest.mark.skip(reason=f"integration tests require {INTEGRATION_ENV}=1")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--llm-cache",
+        action="store_true",
+        default=False,
+        help="replay identical Reasoner LLM prompts from .pytest_cache (set RECORD_LLM=1 to refresh)",
+    )
+
+
+def _api_tests_selected(config) -> bool:
+    """Return True when this run will make real Z.ai API calls.
+
+    The API-backed tests run only with RUN_INTEGRATION=1, and only when a
+    requested path is, contains, or lies inside the integration directory.
+    """
+    if os.environ.get(INTEGRATION_ENV) != "1":
+        return False
+    for arg in config.args:
+        path = (config.invocation_params.dir / arg.split("::")[0]).resolve()
+        if path == API_TESTS_DIR or API_TESTS_DIR in path.parents or path in API_TESTS_DIR.parents:
+            return True
+    return False
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """Size `pytest -n auto` to the Z.ai concurrency budget for API-backed runs.
+
+    Caps the worker count at the budget; the integration reasoner_trials
+    fixture then splits the budget across workers, so concurrent trials on
+    all workers together stay within the per-key limit. Runs that make no
+    API calls keep xdist's default worker count.
+    """
+    if not _api_tests_selected(config):
+        return None
+    budget = int(os.environ.get(ZAI_MAX_CONCURRENT_ENV, "5"))
+    return max(1, min(os.cpu_count() or 1, budget))
+
 
 def pytest_collection_modifyitems(config, items):
-    acceptance = pytest.mark.acceptance
-    integration = pytest.mark.integration
-    unit = pytest.mark.unit
-    mcp = pytest.mark.mcp
+    run_acceptance = os.environ.get(ACCEPTANCE_ENV) == "1"
+    run_integration = os.environ.get(INTEGRATION_ENV) == "1"
 
+    # Label and gate each item in a single pass
     for item in items:
-        nodeid = item.nodeid.replace("\\", "/").lower()
+        nodeid = item.nodeid
+        if "\\" in nodeid:
+            nodeid = nodeid.replace("\\", "/")
+        nodeid = nodeid.lower()
 
         # Heuristic labeling by path/name
         if "/acceptance/" in nodeid or "test_windows_mcp.py" in nodeid:
-            item.add_marker(acceptance)
-            item.add_marker(mcp)
+            item.add_marker(ACCEPTANCE)
+            item.add_marker(MCP)
         elif "/integration/" in nodeid:
-            item.add_marker(integration)
+            item.add_marker(INTEGRATION)
         else:
-            item.add_marker(unit)
+            item.add_marker(UNIT)
 
-    # Apply environment-gated skips
-    run_acceptance = os.environ.get(ACCEPTANCE_ENV) == "1"
-    run_integration = os.environ.get(INTEGRATION_ENV) == "1"
-
-    skip_acceptance = pytest.mark.skip(reason=f"acceptance tests require {ACCEPTANCE_ENV}=1")
-    skip_integration = pytest.mark.skip(reason=f"integration tests require {INTEGRATION_ENV}=1")
-
-    for item in items:
-        if item.get_closest_marker("acceptance") and not run_acceptance:
-            item.add_marker(skip_acceptance)
-        if item.get_closest_marker("integration") and not run_integration:
-            item.add_marker(skip_integration)
+        # Environment-gated skips; explicit markers on the test count too
+        if not run_acceptance and item.get_closest_marker("acceptance"):
+            item.add_marker(SKIP_ACCEPTANCE)
+        if not run_integration and item.get_closest_marker("integration"):
+            item.add_marker(SKIP_INTEGRATION)
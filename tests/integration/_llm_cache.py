@@ -0,0 +1,82 @@
+"""
+On-disk response cache for Reasoner LLM calls in integration tests.
+
+The reasoner tests send byte-identical prompts built from the same
+fixtures, so repeat runs can replay a stored response instead of paying
+a Z.ai round-trip. Enabled with ``pytest --llm-cache``; set RECORD_LLM=1
+to bypass lookups and refresh the stored responses.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+
+class CachedLLM:
+    """Proxy around a chat model that caches invoke/ainvoke responses.
+
+    Keys are the SHA-256 of the model, sampling settings and messages, so
+    any change to the prompt or configuration misses the cache. Every
+    other attribute is forwarded to the wrapped model.
+    """
+
+    def __init__(self, llm, cache_dir: Path, record: bool = False, max_age: float = 86400):
+        self._llm = llm
+        self._cache_dir = Path(cache_dir)
+        self._record = record
+        self._max_age = max_age
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._llm, name)
+
+    def _key(self, messages: List[BaseMessage]) -> str:
+        payload = {
+            "model": getattr(self._llm, "model_name", None),
+            "temperature": getattr(self._llm, "temperature", None),
+            "max_tokens": getattr(self._llm, "max_tokens", None),
+            "messages": [message_to_dict(m) for m in messages],
+        }
+        canonical = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _load(self, key: str) -> Optional[BaseMessage]:
+        if self._record:
+            return None
+        path = self._cache_dir / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime > self._max_age:
+                return None
+            return messages_from_dict([json.loads(path.read_text(encoding="utf-8"))])[0]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store(self, key: str, response: BaseMessage) -> None:
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._cache_dir / f"{key}.json"
+        # Write-then-rename so parallel pytest-xdist workers sharing the
+        # directory never read a half-written entry (os.replace is atomic)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(message_to_dict(response)), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def invoke(self, messages: List[BaseMessage], *args, **kwargs) -> BaseMessage:
+        key = self._key(messages)
+        cached = self._load(key)
+        if cached is not None:
+            return cached
+        response = self._llm.invoke(messages, *args, **kwargs)
+        self._store(key, response)
+        return response
+
+    async def ainvoke(self, messages: List[BaseMessage], *args, **kwargs) -> BaseMessage:
+        key = self._key(messages)
+        cached = self._load(key)
+        if cached is not None:
+            return cached
+        response = await self._llm.ainvoke(messages, *args, **kwargs)
+        self._store(key, response)
+        return response
@@ -5,12 +5,17 @@ These fixtures provide common setup for integration tests including:
 - Mock repositories
 - Test configuration
 - API key management
+- Optional on-disk caching of Reasoner LLM responses (--llm-cache)
 """
+import asyncio
+import importlib
 import pytest
 import json
 import os
 from pathlib import Path
 from agent.config import Settings, LLMConfig
+from agent.nodes.reason_step import areason_step
+from ._llm_cache import CachedLLM
 
 
 @pytest.fixture
@@ -61,7 +66,7 @@ def mock_plan():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_llm_config():
     """Create test LLM configuration."""
     # Check if we have a real API key for integration tests
@@ -91,6 +96,114 @@ def has_api_key():
     return bool(os.getenv("ZAI_API_KEY"))
 
 
+def _llm_cache_enabled(request) -> bool:
+    """--llm-cache is on and the test is not marked no_llm_cache."""
+    return (
+        request.config.getoption("--llm-cache")
+        and request.node.get_closest_marker("no_llm_cache") is None
+    )
+
+
+def _with_llm_cache(request, llm):
+    """Wrap llm in the on-disk response cache for this test."""
+    cache_dir = request.config.cache.mkdir("llm")
+    return CachedLLM(llm, cache_dir, record=os.getenv("RECORD_LLM") == "1")
+
+
+@pytest.fixture(scope="session")
+def shared_reasoner_llm(test_llm_config):
+    """One Reasoner client for the whole session, so every test's calls
+    go through the same keep-alive connection pool."""
+    if not os.getenv("ZAI_API_KEY"):
+        pytest.skip("ZAI_API_KEY not available")
+    from agent.llm_client import create_reasoner_llm
+    return create_reasoner_llm(test_llm_config)
+
+
+@pytest.fixture
+def reasoner_llm(request, shared_reasoner_llm):
+    """The session Reasoner client, behind --llm-cache when enabled.
+
+    Pass it to reason_step via state["_llm"] (or call it directly).
+    """
+    if _llm_cache_enabled(request):
+        return _with_llm_cache(request, shared_reasoner_llm)
+    return shared_reasoner_llm
+
+
+@pytest.fixture(scope="session")
+def reasoner_loop():
+    """One event loop for every async Reasoner call in the session.
+
+    The shared Reasoner client's async HTTP pool is bound to the loop it
+    first ran on, so each test's asyncio.run() would hand it a closed loop;
+    run coroutines with reasoner_loop.run(...) instead.
+    """
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+def _reasoner_slots() -> int:
+    """This worker's share of the Z.ai concurrency budget.
+
+    The budget (ZAI_MAX_CONCURRENT, default 5) is split evenly across the
+    pytest-xdist workers, so concurrent trials on every worker together
+    stay within the per-key limit whenever there are no more workers than
+    budget (as `-n auto` guarantees).
+    """
+    budget = int(os.environ.get("ZAI_MAX_CONCURRENT", "5"))
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return max(1, budget // workers)
+
+
+@pytest.fixture(scope="session")
+def reasoner_trials(reasoner_loop):
+    """Run independent areason_step trials concurrently on reasoner_loop.
+
+    reasoner_trials(state, n) runs n trials, each on its own copy of state,
+    with at most this worker's share of ZAI_MAX_CONCURRENT in flight, and
+    returns the n result states.
+    """
+    slots = asyncio.Semaphore(_reasoner_slots())
+
+    async def trial(state):
+        async with slots:
+            return await areason_step(dict(state))
+
+    async def run_trials(state, n):
+        return await asyncio.gather(*(trial(state) for _ in range(n)))
+
+    def run(state, n):
+        return reasoner_loop.run(run_trials(state, n))
+
+    return run
+
+
+@pytest.fixture(autouse=True)
+def llm_cache(request, monkeypatch):
+    """Replay identical Reasoner prompts from disk when --llm-cache is given.
+
+    Covers clients built through create_reasoner_llm; tests using the
+    reasoner_llm fixture are wrapped there instead. Tests marked
+    no_llm_cache (those that measure variation across repeated calls)
+    always reach the real LLM.
+    """
+    if not _llm_cache_enabled(request):
+        return
+
+    llm_client = importlib.import_module("agent.llm_client")
+    reason_step_module = importlib.import_module("agent.nodes.reason_step")
+    create_uncached = llm_client.create_reasoner_llm
+
+    def create_cached(*args, **kwargs):
+        return _with_llm_cache(request, create_uncached(*args, **kwargs))
+
+    monkeypatch.setattr(reason_step_module, "create_reasoner_llm", create_cached)
+    # Tests that build the LLM themselves imported the factory by name
+    if getattr(request.module, "create_reasoner_llm", None) is create_uncached:
+        monkeypatch.setattr(request.module, "create_reasoner_llm", create_cached)
+
+
 def pytest_configure(config):
     """Configure pytest markers."""
     config.addinivalue_line(
@@ -102,3 +215,6 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "requires_vscode: mark test as requiring VS Code"
     )
+    config.addinivalue_line(
+        "markers", "no_llm_cache: never serve this test's LLM calls from the --llm-cache store"
+    )
@@ -6,17 +6,39 @@ using the actual Z.ai GLM-4.6 API (NO MOCKS for acceptance testing).
 
 Tests are marked with @pytest.mark.integration and @pytest.mark.requires_api_key
 so they can be skipped in environments without API access.
+
+Each test is independent and I/O-bound, so run them in parallel with
+pytest-xdist: `pytest -n auto tests/integration/test_reasoner_with_llm.py`.
+`-n auto` is capped at ZAI_MAX_CONCURRENT (default 5) workers, and the
+reasoner_trials fixture splits that budget across them, so concurrent API
+calls stay within ZAI_MAX_CONCURRENT.
+Add `--dist loadgroup` when running the whole integration directory so the
+desktop-driving VS Code tests stay on a single worker.
+
+Tests share one session-scoped Reasoner client (the reasoner_llm fixture),
+so their requests reuse the same keep-alive HTTPS connections. Concurrent
+trials (reasoner_trials) all run on the session's reasoner_loop, which
+that client's async pool is bound to.
+
+API-backed tests set "_llm_fallback": False so an LLM or transport error
+fails the test instead of being hidden by the round-robin fallback.
 """
 import pytest
 import os
+import re
 from agent.nodes.reason_step import reason_step, _select_work_item_with_llm
-from agent.llm_client import create_reasoner_llm
+
+# Keyword checks are substring matches (so "PRs" or "commits" count), as
+# single case-insensitive alternations rather than a loop over lowercased text
+_REASONING_CONTEXT_RE = re.compile(r"pr|priority|activity|stale|commit|recent|open", re.IGNORECASE)
+_MESSAGE_CONTEXT_RE = re.compile(r"pr|review|commit|update|check|merge|test|fix", re.IGNORECASE)
 
 
 @pytest.mark.integration
 @pytest.mark.requires_api_key
+@pytest.mark.no_llm_cache
 def test_reasoner_selects_high_priority_repo(
-    mock_repos, mock_work_items, mock_plan, test_settings, has_api_key
+    mock_repos, mock_work_items, mock_plan, test_settings, reasoner_llm, reasoner_trials, has_api_key
 ):
     """
     Test that Reasoner selects high-priority repo (with 3 open PRs)
@@ -30,14 +52,15 @@ def test_reasoner_selects_high_priority_repo(
         "repos": mock_repos,
         "work_items": mock_work_items,
         "plan": mock_plan,
-        "_settings": test_settings
+        "_settings": test_settings,
+        "_llm": reasoner_llm,
+        "_llm_fallback": False
     }
 
-    # Run reasoner multiple times to check consistency
+    # Run reasoner multiple times to check consistency; the trials are
+    # independent, so their LLM round-trips run concurrently
     selections = []
-    for _ in range(5):
-        result_state = reason_step(state.copy())
-
+    for result_state in reasoner_trials(state, 5):
         # Verify task envelope was created
         assert result_state.get("task_envelope") is not None, "Task envelope should be created"
 
@@ -74,7 +97,7 @@ def test_reasoner_selects_high_priority_repo(
 @pytest.mark.integration
 @pytest.mark.requires_api_key
 def test_reasoner_reasoning_includes_pr_context(
-    mock_repos, mock_work_items, mock_plan, test_settings, has_api_key
+    mock_repos, mock_work_items, mock_plan, test_settings, reasoner_llm, has_api_key
 ):
     """
     Test that Reasoner's reasoning mentions PRs/activity when selecting repos.
@@ -86,7 +109,9 @@ def test_reasoner_reasoning_includes_pr_context(
         "repos": mock_repos,
         "work_items": mock_work_items,
         "plan": mock_plan,
-        "_settings": test_settings
+        "_settings": test_settings,
+        "_llm": reasoner_llm,
+        "_llm_fallback": False
     }
 
     result_state = reason_step(state)
@@ -96,8 +121,7 @@ def test_reasoner_reasoning_includes_pr_context(
 
     # Check that reasoning mentions relevant context
     # (PRs, activity, priority, etc.)
-    relevant_keywords = ["pr", "priority", "activity", "stale", "commit", "recent", "open"]
-    has_relevant_context = any(keyword in reasoning.lower() for keyword in relevant_keywords)
+    has_relevant_context = _REASONING_CONTEXT_RE.search(reasoning) is not None
 
     assert has_relevant_context, (
         f"Reasoning should mention PRs/activity context. Got: {reasoning}"
@@ -109,7 +133,7 @@ def test_reasoner_reasoning_includes_pr_context(
 @pytest.mark.integration
 @pytest.mark.requires_api_key
 def test_reasoner_generates_contextual_message(
-    mock_repos, mock_work_items, mock_plan, test_settings, has_api_key
+    mock_repos, mock_work_items, mock_plan, test_settings, reasoner_llm, has_api_key
 ):
     """
     Test that Reasoner generates contextual messages, not generic ones.
@@ -121,7 +145,9 @@ def test_reasoner_generates_contextual_message(
         "repos": mock_repos,
         "work_items": mock_work_items,
         "plan": mock_plan,
-        "_settings": test_settings
+        "_settings": test_settings,
+        "_llm": reasoner_llm,
+        "_llm_fallback": False
     }
 
     result_state = reason_step(state)
@@ -134,8 +160,7 @@ def test_reasoner_generates_contextual_message(
     assert message != "Sync on current plan and blockers.", "Message should not be the default"
 
     # Check for context-specific words
-    contextual_words = ["pr", "review", "commit", "update", "check", "merge", "test", "fix"]
-    has_context = any(word in message.lower() for word in contextual_words)
+    has_context = _MESSAGE_CONTEXT_RE.search(message) is not None
 
     assert has_context, f"Message should be contextual. Got: {message}"
 
@@ -184,15 +209,13 @@ def test_reasoner_fallback_on_llm_failure(
 
 @pytest.mark.integration
 @pytest.mark.requires_api_key
-def test_select_work_item_with_llm_direct(test_llm_config, has_api_key):
+def test_select_work_item_with_llm_direct(reasoner_llm, has_api_key):
     """
     Test _select_work_item_with_llm function directly with real LLM.
     """
     if not has_api_key:
         pytest.skip("ZAI_API_KEY not available")
 
-    llm = create_reasoner_llm(test_llm_config)
-
     state = {
         "repos": {
             "test_repo": {
@@ -211,10 +234,11 @@ def test_select_work_item_with_llm_direct(test_llm_config, has_api_key):
         ],
         "plan": {
             "objectives": ["Test objective"]
-        }
+        },
+        "_llm_fallback": False
     }
 
-    result = _select_work_item_with_llm(state, llm)
+    result = _select_work_item_with_llm(state, reasoner_llm)
 
     assert result is not None, "Should return a result"
     work_item, reasoning, message = result
@@ -231,7 +255,7 @@ def test_select_work_item_with_llm_direct(test_llm_config, has_api_key):
 
 @pytest.mark.integration
 @pytest.mark.requires_api_key
-def test_reasoner_handles_no_work_items(test_settings, has_api_key):
+def test_reasoner_handles_no_work_items(test_settings, reasoner_llm, has_api_key):
     """
     Test that Reasoner handles empty work items gracefully.
     """
@@ -242,7 +266,9 @@ def test_reasoner_handles_no_work_items(test_settings, has_api_key):
         "repos": {"test_repo": {"path": "/test", "current_branch": "main", "prs": []}},
         "work_items": [],  # Empty work items
         "plan": {"objectives": []},
-        "_settings": test_settings
+        "_settings": test_settings,
+        "_llm": reasoner_llm,
+        "_llm_fallback": False
     }
 
     result_state = reason_step(state)
@@ -257,8 +283,9 @@ def test_reasoner_handles_no_work_items(test_settings, has_api_key):
 
 @pytest.mark.integration
 @pytest.mark.requires_api_key
+@pytest.mark.no_llm_cache
 def test_reasoner_balances_work_across_repos(
-    mock_repos, mock_plan, test_settings, has_api_key
+    mock_repos, mock_plan, test_settings, reasoner_llm, reasoner_trials, has_api_key
 ):
     """
     Test that Reasoner distributes work across multiple repos over time.
@@ -276,13 +303,14 @@ def test_reasoner_balances_work_across_repos(
         "repos": mock_repos,
         "work_items": work_items,
         "plan": mock_plan,
-        "_settings": test_settings
+        "_settings": test_settings,
+        "_llm": reasoner_llm,
+        "_llm_fallback": False
     }
 
-    # Run reasoner multiple times
+    # Run reasoner multiple times (concurrently)
     selected_repos = []
-    for _ in range(6):
-        result_state = reason_step(state.copy())
+    for result_state in reasoner_trials(state, 6):
         if result_state.get("task_envelope"):
             repo_name = result_state["task_envelope"]["meta"]["repo_name"]
             selected_repos.append(repo_name)
@@ -6,15 +6,27 @@ Tests can be skipped if VS Code is not running or MCP is not available.
 
 IMPORTANT: These are acceptance tests - NO MOCKS allowed per project requirements.
 """
+import copy
+import functools
 import pytest
 import os
+import re
+import sys
 import time
+from contextlib import closing
 from pathlib import Path
+from agent.adapters.base import ScreenshotResult
 from agent.adapters.mcp_adapter import MCPAdapter
 from agent.adapters.stdio_mcp_adapter import StdioMCPAdapter
 from agent.nodes.act_step import act_step, _find_vscode_window, _copy_chat_context
 from agent.config import Settings, load_settings
 
+# Every test here drives the same desktop (focus, clipboard, keystrokes), so
+# under `pytest -n ... --dist loadgroup` they stay together on one worker,
+# which also means one shared mcp_adapter/settings per run. Reasoner tests are
+# left ungrouped so xdist can spread them across workers.
+pytestmark = pytest.mark.xdist_group("vscode_mcp")
+
 
 def is_vscode_running():
     """Check if VS Code is currently running."""
@@ -27,15 +39,61 @@ def is_vscode_running():
         return True
 
 
+def _wait_until(predicate, timeout=0.5, interval=0.01):
+    """Poll predicate until it is true or timeout seconds pass; returns the outcome."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if predicate():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def _foreground_hwnd():
+    """Handle of the current foreground window, or None off Windows."""
+    if sys.platform != "win32":
+        return None
+    import ctypes
+    return ctypes.WinDLL("user32").GetForegroundWindow()
+
+
+def _hwnd_as_int(hwnd):
+    """MCP servers report handles as ints or hex strings ("0x00A00E1A")."""
+    return int(hwnd, 0) if isinstance(hwnd, str) else hwnd
+
+
+@functools.lru_cache(maxsize=1)
 def is_mcp_available():
-    """Check if Windows-MCP is available via npx."""
+    """Check if Windows-MCP is available via npx (probed once per session).
+
+    Beyond the PATH lookup, runs `npx --version` so a broken npx install is
+    reported as a skip up front rather than failing inside adapter setup.
+    """
     import shutil
-    return shutil.which("npx") is not None
+    import subprocess
+
+    npx = shutil.which("npx")
+    if npx is None:
+        return False
+    try:
+        probe = subprocess.run([npx, "--version"], capture_output=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return probe.returncode == 0
 
 
-@pytest.fixture
+# Compiled once for the module; _find_vscode_window accepts a str or a Pattern
+VSCODE_TITLE_REGEX = re.compile(r".*Visual Studio Code.*")
+
+
+@pytest.fixture(scope="session")
 def mcp_adapter():
-    """Create MCP adapter for testing."""
+    """Create one MCP adapter shared by every test in the session.
+
+    The stdio server keeps its pipes open between calls, so tests reuse a
+    single npx/Node process instead of booting one per test.
+    """
     # Try to use stdio adapter (modern approach)
     if is_mcp_available():
         try:
@@ -43,11 +101,12 @@ def mcp_adapter():
                 command="npx",
                 args=["-y", "@curtsortouch/windows-mcp"]
             )
-            yield adapter
-            adapter.close()
-            return
         except Exception as e:
             print(f"Stdio adapter failed: {e}, falling back to HTTP")
+        else:
+            with closing(adapter):
+                yield adapter
+            return
 
     # Fall back to HTTP adapter if available
     # Note: This requires MCP HTTP server to be running
@@ -70,15 +129,50 @@ def mcp_adapter():
         pytest.skip(f"MCP adapter not available: {e}")
 
 
+@pytest.fixture(scope="session")
+def vscode_running():
+    """Whether VS Code is running, checked once for the whole session."""
+    return is_vscode_running()
+
+
+@pytest.fixture(scope="session")
+def vscode_window(mcp_adapter, vscode_running):
+    """The VS Code window the tests drive, looked up once for the session.
+
+    None when MCP or VS Code is unavailable or no window matches.
+    """
+    if not (is_mcp_available() and vscode_running):
+        return None
+    return _find_vscode_window(mcp_adapter, VSCODE_TITLE_REGEX)
+
+
 @pytest.fixture
-def test_state(mcp_adapter):
-    """Create test state with adapter and settings."""
+def preserve_clipboard(mcp_adapter):
+    """Snapshot the clipboard before a test and restore it afterwards."""
+    original = None
+    try:
+        original = mcp_adapter.clipboard_get()
+    except Exception:
+        pass
+
+    yield original
+
+    if original:
+        try:
+            mcp_adapter.clipboard_set(original)
+        except Exception:
+            pass
+
+
+@pytest.fixture(scope="session")
+def settings():
+    """Load settings once per session (config YAML parse + validation)."""
     # Load real settings
     try:
-        settings = load_settings()
+        return load_settings()
     except Exception:
         # Create minimal settings for testing
-        settings = type('Settings', (), {
+        return type('Settings', (), {
             'write_mode': False,  # Default to dry-run for safety
             'window_title_regex': '.*Visual Studio Code.*',
             'copilot': type('Copilot', (), {
@@ -86,8 +180,14 @@ def test_state(mcp_adapter):
             })()
         })()
 
+
+@pytest.fixture
+def test_state(mcp_adapter, settings):
+    """Create test state with adapter and settings."""
+    # Shallow copy so per-test tweaks (e.g. write_mode) don't leak into the
+    # shared session settings
     return {
-        "_settings": settings,
+        "_settings": copy.copy(settings),
         "_adapter": mcp_adapter
     }
 
@@ -113,12 +213,12 @@ def test_mcp_adapter_list_windows(mcp_adapter):
 
 @pytest.mark.integration
 @pytest.mark.requires_vscode
-def test_mcp_adapter_list_vscode_windows(mcp_adapter):
+def test_mcp_adapter_list_vscode_windows(mcp_adapter, vscode_running):
     """Test filtering VS Code windows specifically."""
     if not is_mcp_available():
         pytest.skip("MCP not available")
 
-    if not is_vscode_running():
+    if not vscode_running:
         pytest.skip("VS Code not running")
 
     windows = mcp_adapter.list_windows(app="Code.exe")
@@ -135,16 +235,16 @@ def test_mcp_adapter_list_vscode_windows(mcp_adapter):
 
 @pytest.mark.integration
 @pytest.mark.requires_vscode
-def test_find_vscode_window_helper(mcp_adapter):
+def test_find_vscode_window_helper(mcp_adapter, vscode_running):
     """Test _find_vscode_window helper function."""
     if not is_mcp_available():
         pytest.skip("MCP not available")
 
-    if not is_vscode_running():
+    if not vscode_running:
         pytest.skip("VS Code not running")
 
     # Test with default regex
-    window = _find_vscode_window(mcp_adapter, ".*Visual Studio Code.*")
+    window = _find_vscode_window(mcp_adapter, VSCODE_TITLE_REGEX)
 
     assert window is not None, "Should find a VS Code window"
     assert "hwnd" in window or "id" in window, "Window should have hwnd or id"
@@ -153,16 +253,15 @@ def test_find_vscode_window_helper(mcp_adapter):
 
 @pytest.mark.integration
 @pytest.mark.requires_vscode
-def test_mcp_adapter_screenshot(mcp_adapter):
+def test_mcp_adapter_screenshot(mcp_adapter, vscode_running, vscode_window):
     """Test screenshot capture via MCP adapter."""
     if not is_mcp_available():
         pytest.skip("MCP not available")
 
-    if not is_vscode_running():
+    if not vscode_running:
         pytest.skip("VS Code not running")
 
-    # Find a VS Code window
-    window = _find_vscode_window(mcp_adapter, ".*Visual Studio Code.*")
+    window = vscode_window
     if not window:
         pytest.skip("No VS Code window found")
 
@@ -172,7 +271,7 @@ def test_mcp_adapter_screenshot(mcp_adapter):
     screenshot_bytes = mcp_adapter.screenshot(hwnd=hwnd)
 
     assert screenshot_bytes is not None, "Screenshot should not be None"
-    assert isinstance(screenshot_bytes, bytes), "Screenshot should be bytes"
+    assert isinstance(screenshot_bytes, (bytes, ScreenshotResult)), "Screenshot should be bytes or a lazy base64 PNG"
     assert len(screenshot_bytes) > 1000, "Screenshot should have substantial size (>1KB)"
 
     # Check PNG header (optional validation)
@@ -186,16 +285,15 @@ def test_mcp_adapter_screenshot(mcp_adapter):
 
 @pytest.mark.integration
 @pytest.mark.requires_vscode
-def test_mcp_adapter_focus_window(mcp_adapter):
+def test_mcp_adapter_focus_window(mcp_adapter, vscode_running, vscode_window):
     """Test window focus via MCP adapter."""
     if not is_mcp_available():
         pytest.skip("MCP not available")
 
-    if not is_vscode_running():
+    if not vscode_running:
         pytest.skip("VS Code not running")
 
-    # Find a VS Code window
-    window = _find_vscode_window(mcp_adapter, ".*Visual Studio Code.*")
+    window = vscode_window
     if not window:
         pytest.skip("No VS Code window found")
 
@@ -205,58 +303,44 @@ def test_mcp_adapter_focus_window(mcp_adapter):
     result = mcp_adapter.focus_window(hwnd=hwnd)
 
     assert result is not None, "Focus should return a result"
-    # Give window time to focus
-    time.sleep(0.5)
+    # Wait (up to the old fixed 0.5s) for the window to actually come forward
+    target = _hwnd_as_int(hwnd)
+    _wait_until(lambda: _foreground_hwnd() == target, timeout=0.5)
 
     print(f"✓ Focused window: {window.get('title')}")
 
 
 @pytest.mark.integration
 @pytest.mark.requires_vscode
-def test_mcp_adapter_clipboard_operations(mcp_adapter):
+def test_mcp_adapter_clipboard_operations(mcp_adapter, preserve_clipboard):
     """Test clipboard get/set operations."""
     if not is_mcp_available():
         pytest.skip("MCP not available")
 
-    # Save original clipboard content
-    original_clipboard = None
-    try:
-        original_clipboard = mcp_adapter.clipboard_get()
-    except Exception:
-        pass
-
     test_text = "VSCodePiloter integration test - clipboard test"
 
-    try:
-        # Set clipboard
-        result = mcp_adapter.clipboard_set(test_text)
-        assert result is not None, "Clipboard set should return a result"
-
-        time.sleep(0.2)
+    # Set clipboard
+    result = mcp_adapter.clipboard_set(test_text)
+    assert result is not None, "Clipboard set should return a result"
 
-        # Get clipboard
-        clipboard_content = mcp_adapter.clipboard_get()
-        assert clipboard_content == test_text, f"Clipboard should contain test text. Got: {clipboard_content}"
+    # Wait (up to the old fixed 0.2s) for the clipboard to reflect the write
+    _wait_until(lambda: mcp_adapter.clipboard_get() == test_text, timeout=0.2)
 
-        print(f"✓ Clipboard operations working")
+    # Get clipboard
+    clipboard_content = mcp_adapter.clipboard_get()
+    assert clipboard_content == test_text, f"Clipboard should contain test text. Got: {clipboard_content}"
 
-    finally:
-        # Restore original clipboard content
-        if original_clipboard is not None:
-            try:
-                mcp_adapter.clipboard_set(original_clipboard)
-            except Exception:
-                pass
+    print(f"✓ Clipboard operations working")
 
 
 @pytest.mark.integration
 @pytest.mark.requires_vscode
-def test_act_step_dry_run(test_state):
+def test_act_step_dry_run(test_state, vscode_running):
     """Test act_step in dry-run mode (write_mode=False)."""
     if not is_mcp_available():
         pytest.skip("MCP not available")
 
-    if not is_vscode_running():
+    if not vscode_running:
         pytest.skip("VS Code not running")
 
     # Ensure dry-run mode
@@ -302,78 +386,57 @@ def test_act_step_dry_run(test_state):
 
 @pytest.mark.integration
 @pytest.mark.requires_vscode
-def test_act_step_handles_no_vscode_window():
+def test_act_step_handles_no_vscode_window(mcp_adapter):
     """Test that act_step handles missing VS Code window gracefully."""
     if not is_mcp_available():
         pytest.skip("MCP not available")
 
-    # Create adapter
-    adapter = StdioMCPAdapter(
-        command="npx",
-        args=["-y", "@curtsortouch/windows-mcp"]
-    ) if is_mcp_available() else None
-
-    if not adapter:
-        pytest.skip("Cannot create adapter")
-
-    try:
-        # Create state with impossible window regex
-        state = {
-            "_settings": type('Settings', (), {
-                'write_mode': False,
-                'window_title_regex': 'THIS_WINDOW_DOES_NOT_EXIST_12345',
-                'copilot': type('Copilot', (), {
-                    'command_palette_action': 'GitHub Copilot Chat: Focus on Chat View'
-                })()
-            })(),
-            "_adapter": adapter,
-            "task_envelope": {
-                "type": "desktop_task",
-                "target_repo_path": "/test",
-                "payload": {"message_to_post": "test"}
-            }
+    # Create state with impossible window regex
+    state = {
+        "_settings": type('Settings', (), {
+            'write_mode': False,
+            'window_title_regex': 'THIS_WINDOW_DOES_NOT_EXIST_12345',
+            'copilot': type('Copilot', (), {
+                'command_palette_action': 'GitHub Copilot Chat: Focus on Chat View'
+            })()
+        })(),
+        "_adapter": mcp_adapter,
+        "task_envelope": {
+            "type": "desktop_task",
+            "target_repo_path": "/test",
+            "payload": {"message_to_post": "test"}
         }
+    }
 
-        result_state = act_step(state)
-
-        # Should fail gracefully
-        assert "action_report" in result_state
-        assert result_state["action_report"]["status"] == "failed"
-        assert result_state["action_report"]["reason"] == "no vscode window"
+    result_state = act_step(state)
 
-        print("✓ Act step handles missing window gracefully")
+    # Should fail gracefully
+    assert "action_report" in result_state
+    assert result_state["action_report"]["status"] == "failed"
+    assert result_state["action_report"]["reason"] == "no vscode window"
 
-    finally:
-        if hasattr(adapter, 'close'):
-            adapter.close()
+    print("✓ Act step handles missing window gracefully")
 
 
 @pytest.mark.integration
 @pytest.mark.requires_vscode
-def test_copy_chat_context_helper(mcp_adapter):
+def test_copy_chat_context_helper(mcp_adapter, preserve_clipboard, vscode_running):
     """Test _copy_chat_context helper function."""
     if not is_mcp_available():
         pytest.skip("MCP not available")
 
-    if not is_vscode_running():
+    if not vscode_running:
         pytest.skip("VS Code not running")
 
     # Note: This test just verifies the function doesn't crash
     # It won't actually copy chat content unless VS Code Copilot Chat is open and focused
     try:
-        # Save original clipboard
-        original = mcp_adapter.clipboard_get()
-
         # Attempt to copy (will just get whatever is currently selected/focused)
         copied = _copy_chat_context(mcp_adapter)
 
         assert isinstance(copied, str), "Should return a string (even if empty)"
         print(f"✓ Copy chat context executed (got {len(copied)} chars)")
 
-        # Restore clipboard
-        if original:
-            mcp_adapter.clipboard_set(original)
-
     except Exception as e:
         pytest.skip(f"Copy chat context test skipped: {e}")
 
@@ -7,97 +7,174 @@ Tests cover:
 - Temperature overrides for different agent types
 """
 import os
+import re
 import pytest
-from unittest.mock import patch, MagicMock
-from agent.llm_client import create_llm_client, create_reasoner_llm, create_actor_llm
+from types import SimpleNamespace
+from unittest.mock import patch, create_autospec
+from importlib.util import find_spec
 from agent.config import LLMConfig
 
+# agent.llm_client needs langchain_openai; skip the module in minimal
+# environments without it. find_spec checks for the package without
+# importing it, so the import stays deferred to llm_client_module.
+if find_spec("langchain_openai") is None:
+    pytest.skip("langchain_openai is not installed", allow_module_level=True)
+
+
+# Configuration shared by every test; LLMConfig is only ever read, so one
+# instance serves the whole session (derive variants with model_copy(update=...)
+# rather than mutating it)
+LLM_CONFIG_FIELDS = dict(
+    provider="z.ai",
+    model="glm-4.6",
+    api_key_env="ZAI_API_KEY",
+    api_base="https://api.z.ai/api/coding/paas/v4/",
+    temperature=0.95,
+    max_tokens=131072
+)
+MOCK_API_KEY = "test-api-key-12345"
+
+# Missing-key error: names the problem first, then the variable it checked
+_NO_KEY_RE = re.compile(r"API key not found.*ZAI_API_KEY", re.S)
+
+
+def _expected_kwargs(
+    api_key=MOCK_API_KEY,
+    *,
+    model=LLM_CONFIG_FIELDS["model"],
+    api_base=LLM_CONFIG_FIELDS["api_base"],
+    temperature=LLM_CONFIG_FIELDS["temperature"],
+    max_tokens=LLM_CONFIG_FIELDS["max_tokens"],
+):
+    """ChatOpenAI kwargs a factory passes (defaults match LLM_CONFIG_FIELDS).
+
+    The shared http_client is added at assert time so importing the module
+    stays cheap.
+    """
+    return dict(
+        model=model,
+        openai_api_key=api_key,
+        openai_api_base=api_base,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        streaming=True
+    )
 
-@pytest.fixture
+# (name, factory function in agent.llm_client, temperature of the returned client)
+FACTORY_CASES = [
+    ("reasoner", "create_reasoner_llm", 0.7),
+    ("actor", "create_actor_llm", 0.95),
+    ("base", "create_llm_client", 0.95),
+]
+
+
+@pytest.fixture(scope="session")
+def llm_client_module():
+    """
+    Fixture providing agent.llm_client, imported on first use.
+
+    The module pulls in langchain_openai, so importing it here rather than
+    at the top keeps collection (and runs that deselect these tests) cheap.
+    """
+    import agent.llm_client as module
+    return module
+
+
+@pytest.fixture(scope="session")
 def mock_llm_config():
     """Fixture providing a standard LLM configuration for testing."""
-    return LLMConfig(
-        provider="z.ai",
-        model="glm-4.6",
-        api_key_env="ZAI_API_KEY",
-        api_base="https://api.z.ai/api/coding/paas/v4/",
-        temperature=0.95,
-        max_tokens=131072
-    )
+    return LLMConfig(**LLM_CONFIG_FIELDS)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_api_key():
     """Fixture providing a mock API key."""
-    return "test-api-key-12345"
+    return MOCK_API_KEY
 
 
-class TestCreateLLMClient:
-    """Tests for the create_llm_client function."""
+@pytest.fixture(scope="session")
+def chat_openai_spec(llm_client_module):
+    """An autospec'd ChatOpenAI class, built once (autospec walks the whole class)."""
+    return create_autospec(llm_client_module.ChatOpenAI, spec_set=True)
 
-    @patch('agent.llm_client.ChatOpenAI')
-    def test_create_llm_client_success(self, mock_chat_openai, mock_llm_config, mock_api_key):
+
+@pytest.fixture
+def mock_chat_openai(monkeypatch, llm_client_module, chat_openai_spec):
+    """Patch ChatOpenAI with the (freshly reset) autospec'd mock.
+
+    Each call returns a new instance at the temperature it was created with.
+    """
+    chat_openai_spec.reset_mock()
+    # The factories only read/set .temperature on the instance, so a plain
+    # namespace stands in for it
+    chat_openai_spec.side_effect = lambda *args, **kwargs: SimpleNamespace(temperature=kwargs["temperature"])
+    monkeypatch.setattr(llm_client_module, "ChatOpenAI", chat_openai_spec)
+    return chat_openai_spec
+
+
+class TestLLMFactories:
+    """Tests shared by create_llm_client, create_reasoner_llm and create_actor_llm."""
+
+    @pytest.mark.parametrize("name,factory_name,expected_temp", FACTORY_CASES)
+    def test_factory_builds_client(
+        self, name, factory_name, expected_temp, llm_client_module, mock_chat_openai, mock_llm_config, mock_api_key
+    ):
         """
-        Test successful LLM client creation with valid configuration.
+        Test each factory initializes ChatOpenAI from the config and sets its temperature.
 
-        Verifies that ChatOpenAI is initialized with correct parameters.
+        Verifies the architectural decision:
+        - Reasoner: temp=0.7 for consistent task selection
+        - Actor/base: config temperature (0.95) for more creative responses
         """
         # Arrange
-        mock_instance = MagicMock()
-        mock_chat_openai.return_value = mock_instance
+        factory = getattr(llm_client_module, factory_name)
 
         # Act
-        result = create_llm_client(mock_llm_config, api_key=mock_api_key)
+        result = factory(mock_llm_config, api_key=mock_api_key)
 
         # Assert
         mock_chat_openai.assert_called_once_with(
-            model="glm-4.6",
-            openai_api_key=mock_api_key,
-            openai_api_base="https://api.z.ai/api/coding/paas/v4/",
-            temperature=0.95,
-            max_tokens=131072,
-            streaming=True
+            **_expected_kwargs(mock_api_key), http_client=llm_client_module.get_shared_http_client()
         )
-        assert result == mock_instance
+        assert result.temperature == expected_temp, f"{name} LLM should use temp={expected_temp}"
+
+    @pytest.mark.parametrize("name,factory_name,expected_temp", FACTORY_CASES)
+    def test_factory_no_api_key(self, name, factory_name, expected_temp, llm_client_module, mock_llm_config, monkeypatch):
+        """
+        Test error handling when API key is not provided and not in environment.
+
+        Verifies that a ValueError naming the missing variable is raised.
+        """
+        # Arrange
+        factory = getattr(llm_client_module, factory_name)
+        monkeypatch.delenv("ZAI_API_KEY", raising=False)
+
+        # Act & Assert
+        with pytest.raises(ValueError, match=_NO_KEY_RE):
+            factory(mock_llm_config)
+
+
+class TestCreateLLMClient:
+    """Tests for the create_llm_client function."""
 
     @patch.dict(os.environ, {"ZAI_API_KEY": "env-api-key-67890"})
-    @patch('agent.llm_client.ChatOpenAI')
-    def test_create_llm_client_from_env(self, mock_chat_openai, mock_llm_config):
+    def test_create_llm_client_from_env(self, llm_client_module, mock_chat_openai, mock_llm_config):
         """
         Test LLM client creation using API key from environment variable.
 
         Verifies that the client correctly reads the API key from the
         environment when not provided explicitly.
         """
-        # Arrange
-        mock_instance = MagicMock()
-        mock_chat_openai.return_value = mock_instance
-
         # Act
-        result = create_llm_client(mock_llm_config)
+        result = llm_client_module.create_llm_client(mock_llm_config)
 
         # Assert
         mock_chat_openai.assert_called_once()
         call_kwargs = mock_chat_openai.call_args.kwargs
         assert call_kwargs['openai_api_key'] == "env-api-key-67890"
-        assert result == mock_instance
-
-    @patch.dict(os.environ, {}, clear=True)
-    def test_create_llm_client_no_api_key(self, mock_llm_config):
-        """
-        Test error handling when API key is not provided and not in environment.
-
-        Verifies that a ValueError is raised with an appropriate message.
-        """
-        # Act & Assert
-        with pytest.raises(ValueError) as exc_info:
-            create_llm_client(mock_llm_config)
-
-        assert "API key not found" in str(exc_info.value)
-        assert "ZAI_API_KEY" in str(exc_info.value)
+        assert result.temperature == LLM_CONFIG_FIELDS["temperature"]
 
-    @patch('agent.llm_client.ChatOpenAI')
-    def test_create_llm_client_custom_parameters(self, mock_chat_openai):
+    def test_create_llm_client_custom_parameters(self, llm_client_module, mock_chat_openai):
         """
         Test LLM client creation with custom configuration parameters.
 
@@ -113,158 +190,63 @@ class TestCreateLLMClient:
             temperature=0.3,
             max_tokens=4096
         )
-        mock_instance = MagicMock()
-        mock_chat_openai.return_value = mock_instance
 
         # Act
-        result = create_llm_client(custom_config, api_key="custom-key")
+        result = llm_client_module.create_llm_client(custom_config, api_key="custom-key")
 
         # Assert
         mock_chat_openai.assert_called_once_with(
-            model="gpt-4",
-            openai_api_key="custom-key",
-            openai_api_base="https://api.openai.com/v1/",
-            temperature=0.3,
-            max_tokens=4096,
-            streaming=True
+            **_expected_kwargs(
+                "custom-key",
+                model="gpt-4",
+                api_base="https://api.openai.com/v1/",
+                temperature=0.3,
+                max_tokens=4096
+            ),
+            http_client=llm_client_module.get_shared_http_client()
         )
-        assert result == mock_instance
+        assert result.temperature == 0.3
 
 
-class TestCreateReasonerLLM:
-    """Tests for the create_reasoner_llm function."""
+class TestSharedHttpClient:
+    """Tests for connection-pool sharing across LLM clients."""
 
-    @patch('agent.llm_client.ChatOpenAI')
-    def test_create_reasoner_llm_temperature(self, mock_chat_openai, mock_llm_config, mock_api_key):
+    def test_llm_clients_share_one_http_client(self, llm_client_module, mock_chat_openai, mock_llm_config, mock_api_key):
         """
-        Test Reasoner LLM has temperature override to 0.7.
+        Test that every LLM client is built on the same pooled httpx.Client.
 
-        Verifies that the Reasoner agent uses a lower temperature (0.7)
-        for more consistent and deterministic task selection.
+        Successive reasoner/actor clients should reuse keep-alive
+        connections instead of opening (and TLS-handshaking) new ones.
         """
-        # Arrange
-        mock_instance = MagicMock()
-        mock_instance.temperature = 0.95  # Initial value from config
-        mock_chat_openai.return_value = mock_instance
-
         # Act
-        result = create_reasoner_llm(mock_llm_config, api_key=mock_api_key)
+        llm_client_module.create_reasoner_llm(mock_llm_config, api_key=mock_api_key)
+        llm_client_module.create_actor_llm(mock_llm_config, api_key=mock_api_key)
 
         # Assert
-        # Verify ChatOpenAI was created with default config temperature
-        mock_chat_openai.assert_called_once_with(
-            model="glm-4.6",
-            openai_api_key=mock_api_key,
-            openai_api_base="https://api.z.ai/api/coding/paas/v4/",
-            temperature=0.95,
-            max_tokens=131072,
-            streaming=True
-        )
-
-        # Verify temperature was overridden to 0.7 after creation
-        assert result.temperature == 0.7
+        first, second = (call.kwargs["http_client"] for call in mock_chat_openai.call_args_list)
+        assert first is second is llm_client_module.get_shared_http_client()
 
-    @patch.dict(os.environ, {}, clear=True)
-    def test_create_reasoner_llm_no_api_key(self, mock_llm_config):
+    def test_shared_http_client_keeps_sdk_defaults(self, llm_client_module):
         """
-        Test Reasoner LLM creation fails when API key is missing.
-
-        Verifies that create_reasoner_llm propagates the ValueError
-        from create_llm_client when no API key is available.
+        Test that the shared client is the OpenAI SDK's DefaultHttpxClient,
+        so redirects and the SDK timeout still apply.
         """
-        # Act & Assert
-        with pytest.raises(ValueError) as exc_info:
-            create_reasoner_llm(mock_llm_config)
-
-        assert "API key not found" in str(exc_info.value)
+        from openai import DefaultHttpxClient
 
+        client = llm_client_module.get_shared_http_client()
 
-class TestCreateActorLLM:
-    """Tests for the create_actor_llm function."""
+        assert isinstance(client, DefaultHttpxClient)
+        assert client.follow_redirects is True
 
-    @patch('agent.llm_client.ChatOpenAI')
-    def test_create_actor_llm_temperature(self, mock_chat_openai, mock_llm_config, mock_api_key):
-        """
-        Test Actor LLM uses default temperature (0.95).
+    def test_closed_shared_http_client_is_replaced(self, llm_client_module):
+        """Test that closing the shared client makes the next call open a new one."""
+        client = llm_client_module.get_shared_http_client()
 
-        Verifies that the Actor agent uses the default configuration
-        temperature without any overrides.
-        """
-        # Arrange
-        mock_instance = MagicMock()
-        mock_instance.temperature = 0.95
-        mock_chat_openai.return_value = mock_instance
+        llm_client_module.close_shared_http_client()
 
-        # Act
-        result = create_actor_llm(mock_llm_config, api_key=mock_api_key)
-
-        # Assert
-        mock_chat_openai.assert_called_once_with(
-            model="glm-4.6",
-            openai_api_key=mock_api_key,
-            openai_api_base="https://api.z.ai/api/coding/paas/v4/",
-            temperature=0.95,
-            max_tokens=131072,
-            streaming=True
-        )
-
-        # Verify temperature remains at default 0.95
-        assert result.temperature == 0.95
-
-    @patch('agent.llm_client.ChatOpenAI')
-    def test_create_actor_llm_returns_base_client(self, mock_chat_openai, mock_llm_config, mock_api_key):
-        """
-        Test Actor LLM is created using base create_llm_client function.
-
-        Verifies that create_actor_llm is a thin wrapper around
-        create_llm_client with no temperature modification.
-        """
-        # Arrange
-        mock_instance = MagicMock()
-        mock_instance.temperature = 0.95  # Set initial temperature
-        mock_chat_openai.return_value = mock_instance
-
-        # Act
-        result = create_actor_llm(mock_llm_config, api_key=mock_api_key)
-
-        # Assert
-        assert result == mock_instance
-        # Temperature should not be modified (stays at config default)
-        assert result.temperature == 0.95
-
-
-class TestTemperatureComparison:
-    """Integration tests comparing temperature settings across agent types."""
-
-    @patch('agent.llm_client.ChatOpenAI')
-    def test_reasoner_vs_actor_temperature(self, mock_chat_openai, mock_llm_config, mock_api_key):
-        """
-        Test that Reasoner and Actor use different temperatures.
-
-        Verifies the architectural decision:
-        - Reasoner: temp=0.7 for consistent task selection
-        - Actor: temp=0.95 for more creative responses
-        """
-        # Arrange
-        def create_mock_with_temp(temp):
-            mock = MagicMock()
-            mock.temperature = temp
-            return mock
-
-        # Create two separate mock instances
-        reasoner_mock = create_mock_with_temp(0.95)  # Will be overridden to 0.7
-        actor_mock = create_mock_with_temp(0.95)     # Will stay at 0.95
-
-        mock_chat_openai.side_effect = [reasoner_mock, actor_mock]
-
-        # Act
-        reasoner = create_reasoner_llm(mock_llm_config, api_key=mock_api_key)
-        actor = create_actor_llm(mock_llm_config, api_key=mock_api_key)
-
-        # Assert
-        assert reasoner.temperature == 0.7, "Reasoner should use temp=0.7 for consistency"
-        assert actor.temperature == 0.95, "Actor should use temp=0.95 for creativity"
-        assert reasoner.temperature != actor.temperature, "Different agents should use different temperatures"
+        assert client.is_closed
+        replacement = llm_client_module.get_shared_http_client()
+        assert replacement is not client and not replacement.is_closed
 
 
 # Run tests with coverage
@@ -1,4 +1,7 @@
+"""Tests for monitor summary helpers."""
+
 import json
+import math
 from pathlib import Path
 
 import pytest
@@ -47,13 +50,68 @@ def test_compute_window_stats_reports_counts():
     assert stats["max_copilot_chars"] == 50
 
 
-def test_load_and_locate_summary(tmp_path):
-    logs_dir = tmp_path / "logs"
-    summaries_dir = logs_dir / "summaries"
-    summaries_dir.mkdir(parents=True)
+@pytest.mark.parametrize("n", [2, 1000, 100_000])
+def test_compute_window_stats_single_pass_matches_reference(n):
+    windows = [
+        {
+            "index": i,
+            "is_busy": i % 3 == 0 if i % 5 else None,
+            "focus_ms": float(i % 200),
+            "state_ms": i % 7,
+            "transcript_ms": None if i % 4 == 0 else 10.5,
+            "copilot_text_length": (i * 37) % 1001,
+            "transcript_length": i % 11,
+            "screenshot": None if i % 2 else f"{i}.png",
+        }
+        for i in range(n)
+    ]
+
+    stats = compute_window_stats({"window_metrics": windows})
+
+    def numbers(field):
+        return [float(w[field]) for w in windows if isinstance(w[field], (int, float))]
+
+    def avg(field):
+        values = numbers(field)
+        return round(sum(values) / len(values), 2) if values else 0.0
+
+    assert stats["window_count"] == n
+    assert stats["busy_windows"] == sum(1 for w in windows if w["is_busy"])
+    assert stats["ready_windows"] == sum(1 for w in windows if w["is_busy"] is False)
+    assert stats["screenshots_missing"] == sum(1 for w in windows if not w["screenshot"])
+    for key, field in [
+        ("avg_focus_ms", "focus_ms"),
+        ("avg_state_ms", "state_ms"),
+        ("avg_transcript_ms", "transcript_ms"),
+        ("avg_copilot_chars", "copilot_text_length"),
+        ("avg_transcript_chars", "transcript_length"),
+    ]:
+        assert stats[key] == pytest.approx(avg(field), abs=0.01)
+    assert stats["max_copilot_chars"] == max(numbers("copilot_text_length"))
+    assert stats["max_transcript_chars"] == max(numbers("transcript_length"))
+
+
+def test_compute_window_stats_empty_summary():
+    stats = compute_window_stats({})
+
+    assert stats["window_count"] == 0
+    assert stats["avg_focus_ms"] == 0.0
+    assert stats["max_copilot_chars"] == 0.0
+
 
+@pytest.fixture(scope="session")
+def summary_tree(tmp_path_factory):
+    """A logs/summaries tree holding one empty summary, built once and only read."""
+    logs_dir = tmp_path_factory.mktemp("logs")
+    summaries_dir = logs_dir / "summaries"
+    summaries_dir.mkdir()
     summary_path = summaries_dir / "vscode_monitor_20250101_000000.json"
-    summary_path.write_text(json.dumps({"window_metrics": []}), encoding="utf-8")
+    summary_path.write_text('{"window_metrics": []}', encoding="utf-8")
+    return logs_dir, summary_path
+
+
+def test_load_and_locate_summary(summary_tree):
+    logs_dir, summary_path = summary_tree
 
     loaded = load_summary(summary_path)
     assert loaded["window_metrics"] == []
@@ -61,3 +119,27 @@ def test_load_and_locate_summary(tmp_path):
     latest = latest_summary_path(logs_dir)
     assert latest == summary_path
 
+
+def test_load_summary_without_orjson(tmp_path, monkeypatch):
+    import agent.diagnostics.monitor_summary as monitor_summary
+
+    monkeypatch.setattr(monitor_summary, "orjson", None)
+    summary_path = tmp_path / "vscode_monitor_20250101_000000.json"
+    summary_path.write_text(json.dumps({"log_path": "logs/ü.log"}), encoding="utf-8")
+
+    assert monitor_summary.load_summary(summary_path) == {"log_path": "logs/ü.log"}
+
+
+def test_load_summary_reads_stdlib_only_values(tmp_path):
+    # NaN and integers beyond 64 bits are valid for the stdlib json writer;
+    # loading them must not depend on whether orjson is installed.
+    summary_path = tmp_path / "vscode_monitor_20250101_000000.json"
+    summary_path.write_text(
+        json.dumps({"window_metrics": [{"focus_ms": float("nan"), "transcript_length": 2**70}]}),
+        encoding="utf-8",
+    )
+
+    metrics = load_summary(summary_path)["window_metrics"][0]
+
+    assert math.isnan(metrics["focus_ms"])
+    assert metrics["transcript_length"] == 2**70
@@ -0,0 +1,31 @@
+import base64
+import os
+
+import pytest
+
+from agent.adapters.base import ScreenshotResult, screenshot_to_b64
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _mime_wrap(b64: str, newline: str) -> str:
+    """Split base64 text into 76-character lines, as MIME encoders do."""
+    return "".join(b64[i:i + 76] + newline for i in range(0, len(b64), 76))
+
+
+@pytest.mark.parametrize("newline", [None, "\n", "\r\n"], ids=["unwrapped", "lf", "crlf"])
+@pytest.mark.parametrize("padding", [0, 1, 2])
+def test_len_and_prefix_match_decoded_bytes(newline, padding):
+    # 1008 bytes is a multiple of 3, so trimming 0-2 bytes covers every
+    # number of trailing "=" characters
+    data = (PNG_SIGNATURE + os.urandom(1000))[: 1008 - padding]
+    b64 = base64.b64encode(data).decode("ascii")
+    if newline is not None:
+        b64 = _mime_wrap(b64, newline)
+
+    screenshot = ScreenshotResult(b64)
+
+    assert len(screenshot) == len(data) == len(screenshot.bytes)
+    assert screenshot.startswith(PNG_SIGNATURE)
+    assert not screenshot.startswith(b"GIF89a")
+    assert base64.b64decode(screenshot_to_b64(screenshot), validate=True) == data
@@ -1,7 +1,9 @@
 import asyncio
+import difflib
 import json
+import math
 
-from agent.tools.vscode_copilot_monitor import VSCodeCopilotMonitor
+from agent.tools.vscode_copilot_monitor import VSCodeCopilotMonitor, parse_state_tool_text
 
 
 class _FakeContent:
@@ -55,6 +57,18 @@ def test_filter_vscode_windows_only_matches_titles():
     assert titles == ["proj - Visual Studio Code", "Code - Insiders"]
 
 
+def test_check_window_keys_history_by_handle():
+    monitor = VSCodeCopilotMonitor("fake-path")
+    window = {"title": "a.py - proj - Visual Studio Code", "handle": "0x01"}
+    monitor.win_session = _FakeSession([{"windows": [window], "textual": []}], "Transcript")
+
+    result = _run(monitor._check_window(window))
+
+    assert result["key"] == "0x01"
+    assert monitor.history["0x01"].transcript == "Transcript"
+    assert window == {"title": "a.py - proj - Visual Studio Code", "handle": "0x01"}
+
+
 def test_extract_copilot_text_limits_to_right_side():
     monitor = VSCodeCopilotMonitor("fake-path")
     window = {"x": 100, "y": 50, "width": 1000, "height": 600}
@@ -92,7 +106,6 @@ def test_monitor_tracks_history_and_busy_detection():
 
     states_run_one = [
         {"windows": [window], "textual": [], "screen_width": 2000, "screen_height": 1200},
-        {"windows": [window], "textual": []},
         {"windows": [window], "textual": textual_first},
     ]
 
@@ -103,11 +116,12 @@ def test_monitor_tracks_history_and_busy_detection():
     assert len(results_one) == 1
     assert results_one[0]["is_busy"] is True
     assert any(call[0] == "Click-Tool" for call in session_one.calls)
-    assert monitor.history[window["title"]]["transcript"] == "Transcript one"
+    # One snapshot for screen size + window discovery, one after focusing
+    assert [call[0] for call in session_one.calls].count("State-Tool") == 2
+    assert monitor.history[window["title"]].transcript == "Transcript one"
 
     states_run_two = [
         {"windows": [window], "textual": [], "screen_width": 2000, "screen_height": 1200},
-        {"windows": [window], "textual": []},
         {"windows": [window], "textual": textual_second},
     ]
 
@@ -117,4 +131,91 @@ def test_monitor_tracks_history_and_busy_detection():
     assert len(results_two) == 1
     assert results_two[0]["is_busy"] is False
     assert "Transcript two" in results_two[0]["transcript_diff"]
-    assert monitor.history[window["title"]]["copilot_text"].startswith("Answer ready")
+    assert monitor.history[window["title"]].copilot_text.startswith("Answer ready")
+
+
+def test_get_state_decodes_json_without_orjson(monkeypatch):
+    import agent.tools.vscode_copilot_monitor as monitor_module
+
+    monkeypatch.setattr(monitor_module, "orjson", None)
+    monitor = VSCodeCopilotMonitor("fake-path")
+    state = {"windows": [{"title": "ü - Visual Studio Code"}], "textual": []}
+    monitor.win_session = _FakeSession([state], "")
+
+    assert _run(monitor._get_state()) == state
+
+
+def test_get_state_falls_back_to_json_when_orjson_rejects(monkeypatch):
+    import agent.tools.vscode_copilot_monitor as monitor_module
+
+    class _RejectingOrjson:
+        class JSONDecodeError(ValueError):
+            pass
+
+        @classmethod
+        def loads(cls, text):
+            raise cls.JSONDecodeError("unsupported value")
+
+    monkeypatch.setattr(monitor_module, "orjson", _RejectingOrjson)
+    monitor = VSCodeCopilotMonitor("fake-path")
+    # NaN and integers beyond 64 bits are valid for json but not for orjson
+    state = {"windows": [{"title": "proj - Visual Studio Code", "handle": 2**70}], "score": float("nan")}
+    monitor.win_session = _FakeSession([state], "")
+
+    parsed = _run(monitor._get_state())
+
+    assert parsed["windows"] == state["windows"]
+    assert math.isnan(parsed["score"])
+
+
+def test_diff_trims_common_lines_but_keeps_hunk_positions():
+    old = "".join(f"PS> command {i}\n" for i in range(50))
+    new = old.replace("command 20\n", "command twenty\n") + "Transcript two\n"
+
+    diff = VSCodeCopilotMonitor._diff(old, new)
+
+    expected = "".join(
+        difflib.unified_diff(
+            old.splitlines(keepends=True), new.splitlines(keepends=True), n=2, lineterm=""
+        )
+    )
+    assert diff == expected
+    assert "@@ -19,5 +19,5 @@" in diff
+
+
+def test_parse_state_tool_text_reads_window_rows():
+    text = "\n".join(
+        [
+            "Opened Apps:",
+            "Name                                   Depth  Status     Width  Height  Handle",
+            "-----------------------------------  -------  ---------  -----  ------  ------",
+            "CLAUDE.md - repo - Visual Studio Code      1  Maximized   1920    1040  0x00A00E1A",
+            "          2  Normal      800     600  0x0001",
+            "not a window row",
+        ]
+    )
+
+    state = parse_state_tool_text(text)
+
+    assert state["windows"] == [
+        {
+            "title": "CLAUDE.md - repo - Visual Studio Code",
+            "depth": "1",
+            "status": "Maximized",
+            "width": 1920,
+            "height": 1040,
+            "handle": "0x00A00E1A",
+            "x": 0,
+            "y": 0,
+        },
+        {
+            "title": "Unknown",
+            "depth": "2",
+            "status": "Normal",
+            "width": 800,
+            "height": 600,
+            "handle": "0x0001",
+            "x": 0,
+            "y": 0,
+        },
+    ]